@@ -24,6 +24,7 @@ Tool Objectives:
 from urllib3.util.retry import Retry
 from urllib3.exceptions import InsecureRequestWarning
 from requests.adapters import HTTPAdapter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from PyQt5.QtWidgets import (
     QAbstractItemView,
     QApplication,
@@ -61,6 +62,8 @@ from PyQt5.QtGui import (
     QFont,
     QKeySequence,
     QPalette,
+    QStandardItem,
+    QStandardItemModel,
     QSyntaxHighlighter,
     QTextCharFormat,
 )
@@ -76,19 +79,15 @@ from PyQt5.QtCore import (
     pyqtSignal,
     pyqtSlot,
 )
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Border, Font, PatternFill, Side
-from openpyxl import load_workbook
-import win32com.client as win32
 import urllib3
 import requests
 import pandas as pd
-import keyring
 from typing import Dict, List, Optional
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 import webbrowser
-import uuid
+import types
 import time
 import threading
 import sys
@@ -99,13 +98,22 @@ import re
 import os
 import json
 import io
+import csv
 import hashlib
-import glob
+import zlib
+import atexit
 import fnmatch
+import functools
 import ctypes
 import copy
 import base64
 import random
+import weakref
+
+try:
+    import orjson  # optional: faster (de)serialization of the per-user JSON files
+except ImportError:
+    orjson = None
 
 APP_VERSION = "Baseline-2025-08-27-a"
 
@@ -115,6 +123,13 @@ PN_REGEXES = [
     r"\b\d{5,}[A-Z]?\b",
     r"\b[A-Z0-9]{4,}[-_\.][A-Z0-9]{2,}\b",
 ]
+# Compiled once; each pattern keeps its own pass so overlapping candidates survive
+_PN_PATTERNS = tuple(re.compile(p, re.I) for p in PN_REGEXES)
+# Single-pass gate: text with no PN-shaped run at all skips the per-pattern scans
+_PN_ANY = re.compile("|".join(f"(?:{p})" for p in PN_REGEXES), re.I)
+# Free-text tokenizer for PN fallbacks, and a delete-table for counting ASCII digits in C
+_PN_TOKEN_SPLIT = re.compile(r"[^\w\-\.]+")
+_DROP_DIGITS = str.maketrans("", "", "0123456789")
 
 # --- Environment quirks (ZScaler MITM) ---
 urllib3.disable_warnings(InsecureRequestWarning)
@@ -128,6 +143,8 @@ ITEMS_VIEW = "item_master"
 #ITEMS_VIEW = "inv_item_master"
 INV_VIEW = "inventory_search_all"
 ITEM_CONTROLS = "bv_psfinance_ps_master_item_tbl"
+# concurrent chunk requests per fetch; stays under the session's pool_maxsize
+DENODO_MAX_WORKERS = 8
 
 # Only show these if present
 DESIRED_HEADERS = [
@@ -151,7 +168,8 @@ DESIRED_HEADERS = [
     "ctrl_in",
     "group_description",
 ]
-POSSIBLE_BUS = {
+# Read-only: shared by every pane/thread without defensive copies
+POSSIBLE_BUS = types.MappingProxyType({
     "BR001": "BR001 - Boris 01",
     "BUABO": "Oceaneering Intl Services Ltd",
     "BUACE": "Oceaneering Mobile Robotics BV",
@@ -252,8 +270,9 @@ POSSIBLE_BUS = {
     "MG029": "Magnum 29",
     "MG030": "Magnum 030",
     "MG031": "Magnum 031",
-}
-DEFAULT_BUS = ["BUIEH", "BUMCO", "BUMAC"]
+})
+DEFAULT_BUS = frozenset({"BUIEH", "BUMCO", "BUMAC"})
+_BU_KEYS_SORTED = tuple(sorted(POSSIBLE_BUS))
 
 # ----------------------------------
 # Utilities
@@ -265,6 +284,25 @@ def ensure_dir(d: str) -> str:
     return d
 
 
+def _json_dumps(obj) -> bytes:
+    """Serialize to indented UTF-8 bytes; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            pass  # e.g. ints wider than 64 bits; let stdlib json handle it
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data):
+    """Parse JSON from bytes/str; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def _win_path(env_name: str, fallback: Path) -> Path:
     p = os.environ.get(env_name, "") or ""
     try:
@@ -274,12 +312,12 @@ def _win_path(env_name: str, fallback: Path) -> Path:
     return p
 
 
+@functools.lru_cache(maxsize=1)
 def app_paths() -> dict:
-    """Centralized app paths, using per-user AppData (writeable, no admin)."""
+    """Centralized app paths, using per-user AppData (writeable, no admin).
+    Cached for the process; directories are created once by _ensure_dirs()."""
     base_user = _win_path("APPDATA", Path.home() / "AppData" / "Roaming") / "PartSearch"
     base_shared = _win_path("PROGRAMDATA", Path("C:/ProgramData")) / "PartSearch"
-    base_user.mkdir(parents=True, exist_ok=True)
-    (base_user / "index").mkdir(parents=True, exist_ok=True)
     return {
         "base_user": base_user,
         "base_shared": base_shared,
@@ -294,8 +332,7 @@ def app_paths() -> dict:
 
 def _read_user_prefs() -> dict:
     try:
-        with open(str(app_paths()["prefs"]), "r", encoding="utf-8") as f:
-            return json.load(f) or {}
+        return _read_json_cached(str(app_paths()["prefs"])) or {}
     except Exception:
         return {}
 
@@ -320,14 +357,12 @@ def _write_user_prefs(updates: dict) -> None:
 
 # --- Paths and Directories ---
 P = app_paths()
-PROGRAMDATA_DIR = ensure_dir(
-    os.path.join(os.environ.get("PROGRAMDATA", r"C:\ProgramData"), "PartSearch")
+PROGRAMDATA_DIR = os.path.join(
+    os.environ.get("PROGRAMDATA", r"C:\ProgramData"), "PartSearch"
 )
-LOCALAPPDATA_DIR = ensure_dir(
-    os.path.join(
-        os.environ.get("LOCALAPPDATA", os.path.expanduser(r"~\AppData\Local")),
-        "PartSearch",
-    )
+LOCALAPPDATA_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA", os.path.expanduser(r"~\AppData\Local")),
+    "PartSearch",
 )
 INDEX_ROOTS_JSON = str(P["index_roots"])
 SEARCH_LOCATIONS_JSON = str(P["locations"])
@@ -344,6 +379,7 @@ PREF_WHITELIST = {
     "psft_defaults",
     "bus_defaults",
     "file_inputs",
+    "rest_cache_ttl_s",
 }
 
 if "DEFAULT_PREFS" not in globals():
@@ -383,6 +419,12 @@ DEFAULT_ENOVIA_CACHE = {"last_sync": None, "records": []}
 
 def _win_apps_uses_light() -> bool:
     """True if Windows 'AppsUseLightTheme' is 1 (light), False if 0 (dark)."""
+    # 5 s buckets: theme re-applies skip the registry, a user toggle still lands quickly
+    return _win_apps_uses_light_cached(int(time.monotonic() // 5))
+
+
+@functools.lru_cache(maxsize=1)
+def _win_apps_uses_light_cached(_bucket: int) -> bool:
     try:
         import winreg
 
@@ -452,6 +494,8 @@ def get_basic_auth_header(
     service: str, username: Optional[str] = None
 ) -> Dict[str, str]:
     """Pull credentials from keyring and return headers with Basic auth. Store with keyring.set_password(service, username, password)."""
+    import keyring  # deferred: backend discovery is slow and only auth needs it
+
     if username:
         pwd = keyring.get_password(service, username)
         if pwd is None:
@@ -474,29 +518,95 @@ def get_basic_auth_header(
 
 
 def _ensure_dirs():
-    os.makedirs(PROGRAMDATA_DIR, exist_ok=True)
+    """Create every app directory once per process (called from bootstrap_files)."""
+    p = app_paths()
+    p["base_user"].mkdir(parents=True, exist_ok=True)
+    p["index_dir"].mkdir(parents=True, exist_ok=True)
+    ensure_dir(LOCALAPPDATA_DIR)
+    try:
+        ensure_dir(PROGRAMDATA_DIR)
+    except OSError:
+        pass  # machine defaults are optional; ProgramData may be locked down
+
+
+# Cache-aside for the small per-user JSON files: path -> ((mtime_ns, size), obj).
+# Keyed on the file's stat so edits from another process are still picked up.
+_JSON_CACHE: dict = {}
+_JSON_CACHE_LOCK = threading.Lock()
+
+
+def _json_cache_store(path: str, data) -> None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    with _JSON_CACHE_LOCK:
+        _JSON_CACHE[str(path)] = ((st.st_mtime_ns, st.st_size), copy.deepcopy(data))
+
+
+def _read_json_cached(path: str):
+    """
+    JSON from path, served from memory while the file is unchanged on disk.
+    Returns a private copy (callers mutate freely). Raises on missing/invalid files.
+    """
+    path = str(path)
+    st = os.stat(path)
+    sig = (st.st_mtime_ns, st.st_size)
+    with _JSON_CACHE_LOCK:
+        hit = _JSON_CACHE.get(path)
+    if hit is not None and hit[0] == sig:
+        return copy.deepcopy(hit[1])
+    with open(path, "rb") as f:
+        data = _json_loads(f.read())
+    with _JSON_CACHE_LOCK:
+        _JSON_CACHE[path] = (sig, data)
+    return copy.deepcopy(data)
+
+
+_ATOMIC_WRITE_LOCK = threading.Lock()
+
+
+def _replace_bytes_atomic(path: str, payload: bytes) -> None:
+    """Write payload to '<path>.tmp' with raw os.write, then os.replace() over path.
+    One stable tmp name per file (not a fresh UUID each save) keeps AV/EDR from
+    scanning a new file every time; the lock stops two threads sharing it.
+    No fsync: replace() alone guarantees readers never see a torn file."""
+    tmp = path + ".tmp"
+    with _ATOMIC_WRITE_LOCK:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(tmp, flags, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        # atomic on same volume; also avoids WinError 5 races with AV/EDR
+        os.replace(tmp, path)
 
 
 def _atomic_write_json(path: str, data: dict) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    # atomic on same volume; also avoids WinError 5 races with AV/EDR
-    os.replace(tmp, path)
+    _replace_bytes_atomic(path, _json_dumps(data))
+    _json_cache_store(path, data)
+
+
+# Root lists are re-normalized on every merge/dedupe; the same few hundred paths
+# repeat, so memoize (bounded) instead of re-running normpath/normcase.
+@functools.lru_cache(maxsize=4096)
+def _canon_key_cached(p: str) -> str:
+    return os.path.normcase(os.path.normpath(p)).rstrip("\\/")
 
 
 def _canon_key(p: str) -> str:
     if not p:
         return ""
-    k = os.path.normcase(os.path.normpath(p)).rstrip("\\/")
-    return k
+    return _canon_key_cached(os.fspath(p))
 
 
 def _load_json_or_default(path: str, default: dict) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json_cached(path)
         if not isinstance(data, dict):
             return default
         return data
@@ -504,9 +614,16 @@ def _load_json_or_default(path: str, default: dict) -> dict:
         return default
 
 
+@functools.lru_cache(maxsize=4096)
+def _normkey_cached(p: str) -> str:
+    return os.path.normcase(os.path.normpath(p))
+
+
 def _normkey(p: str) -> str:
     # normalize & case-fold so dedupe works across OS case handling
     try:
+        if isinstance(p, str):
+            return _normkey_cached(p)
         return os.path.normcase(os.path.normpath(p))
     except Exception:
         return p.strip()
@@ -541,6 +658,10 @@ def read_index_roots_json() -> dict:
     return {"roots": roots}
 
 
+def _as_count(v) -> int:
+    return int(v or 0)
+
+
 def write_index_roots_json(data: dict) -> None:
     """
     Merge incoming roots into existing index_roots.json (per-user).
@@ -548,32 +669,29 @@ def write_index_roots_json(data: dict) -> None:
     """
     # read current
     try:
-        with open(INDEX_ROOTS_JSON, "r", encoding="utf-8") as f:
-            current = json.load(f) or {}
+        current = _read_json_cached(INDEX_ROOTS_JSON) or {}
     except Exception:
         current = {}
 
-    cur_roots = current.get("roots", [])
+    # 'current' is already a private copy (see _read_json_cached): merge in place
     by_key = {
-        _canon_key(r.get("path", "")): dict(r) for r in cur_roots if r.get("path")
+        _canon_key(r["path"]): r for r in current.get("roots", []) if r.get("path")
     }
 
     for r in (data or {}).get("roots", []):
         p = (r.get("path") or "").strip()
         if not p:
             continue
-        k = _canon_key(p)
-        cur = by_key.get(k, {"path": p})
+        cur = by_key.setdefault(_canon_key(p), {"path": p})
+        get = r.get
 
         # preserve/merge your known fields
-        cur["checked"] = bool(r.get("checked", cur.get("checked", True)))
-        cur["files_count"] = int(r.get("files_count", cur.get("files_count", 0)) or 0)
-        cur["updated_count"] = int(
-            r.get("updated_count", cur.get("updated_count", 0)) or 0
+        cur["checked"] = bool(get("checked", cur.get("checked", True)))
+        cur["files_count"] = _as_count(get("files_count", cur.get("files_count")))
+        cur["updated_count"] = _as_count(
+            get("updated_count", cur.get("updated_count"))
         )
-        cur["last_full_scan"] = r.get("last_full_scan", cur.get("last_full_scan"))
-
-        by_key[k] = cur
+        cur["last_full_scan"] = get("last_full_scan", cur.get("last_full_scan"))
 
     out = {"roots": list(by_key.values())}
     _atomic_write_json(INDEX_ROOTS_JSON, out)
@@ -581,8 +699,7 @@ def write_index_roots_json(data: dict) -> None:
 
 def read_search_locations() -> dict:
     try:
-        with open(SEARCH_LOCATIONS_JSON, "r", encoding="utf-8") as f:
-            obj = json.load(f)
+        obj = _read_json_cached(SEARCH_LOCATIONS_JSON)
     except Exception:
         return {"checked_roots": []}
 
@@ -643,17 +760,14 @@ def write_search_locations(data) -> None:
 
 def save_json_atomic(path: Path, obj) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = Path(str(path) + ".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-    os.replace(tmp, path)  # atomic on Win11
+    _replace_bytes_atomic(str(path), _json_dumps(obj))
+    _json_cache_store(path, obj)
 
 
 def load_json_or_default(path: Path, default_obj):
     try:
         if path.exists() and path.stat().st_size > 0:
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            return _read_json_cached(path)
     except Exception:
         pass
     save_json_atomic(path, default_obj)
@@ -671,7 +785,13 @@ def maybe_migrate_from_programdata(src_path: Path, dst_path: Path):
 
 
 def _tz_abbrev(dt: datetime) -> str:
-    name = (dt.tzname() or "").strip()
+    return _tz_abbrev_for(dt.tzname() or "")
+
+
+@functools.lru_cache(maxsize=8)
+def _tz_abbrev_for(tzname: str) -> str:
+    # keyed on the zone name, so a DST switch still yields the new abbreviation
+    name = tzname.strip()
     if not name:
         return "UTC"
     if " " in name:  # e.g., "Central Daylight Time" -> "CDT"
@@ -687,7 +807,14 @@ def local_now_short() -> str:
 # ---- default JSON contents ----
 def bootstrap_files():
     """Create any missing JSONs in %APPDATA%\\PartSearch and migrate old ones."""
+    _ensure_dirs()
     p = app_paths()
+    # drop temp files orphaned by an interrupted atomic write (incl. old UUID-named ones)
+    for stale in p["base_user"].glob("*.tmp"):
+        try:
+            stale.unlink()
+        except OSError:
+            pass
     # migrate once from ProgramData (legacy installs)
     maybe_migrate_from_programdata(p["base_shared"] / "user_prefs.json", p["prefs"])
     maybe_migrate_from_programdata(
@@ -714,10 +841,8 @@ def enovia_config():
     """Read ENOVIA Online policy. Safe defaults if policy.json is missing."""
     try:
         pdir = os.environ.get("PROGRAMDATA", r"C:\ProgramData")
-        with open(
-            os.path.join(pdir, "PartSearch", "policy.json"), "r", encoding="utf-8"
-        ) as f:
-            pol = json.load(f)
+        with open(os.path.join(pdir, "PartSearch", "policy.json"), "rb") as f:
+            pol = _json_loads(f.read())
     except Exception:
         pol = {}
     cfg = pol.get("enovia_online", {})
@@ -764,7 +889,14 @@ def index_db_path(root: str) -> str:
                 key = key + os.sep
     except Exception:
         key = (root or "").strip()
-    h = hashlib.sha1(key.encode("utf-8", "ignore")).hexdigest()[:12]
+    raw = key.encode("utf-8", "ignore")
+    # indexes built before the SHA-256 switch live under the SHA-1 name; keep using them
+    legacy = os.path.join(
+        idx_dir, hashlib.sha1(raw).hexdigest()[:12], "index_db.sqlite"
+    )
+    if os.path.exists(legacy):
+        return legacy
+    h = hashlib.sha256(raw).hexdigest()[:12]
     dbp = os.path.join(idx_dir, h, "index_db.sqlite")
     os.makedirs(os.path.dirname(dbp), exist_ok=True)
     return dbp
@@ -798,32 +930,59 @@ def _ensure_meta_schema(db_path: str):
             c.commit()
 
 
+def _meta_text(con, *keys: str) -> str:
+    """
+    First non-empty meta value for keys (in priority order), from either the
+    legacy 'val' or the newer 'value' column. One statement; SELECT * tolerates
+    tables that only have one of the two columns.
+    """
+    cur = con.execute(
+        f"SELECT * FROM meta WHERE key IN ({','.join('?' * len(keys))})", keys
+    )
+    cols = [d[0] for d in cur.description]
+    found = {}
+    for row in cur:
+        rec = dict(zip(cols, row))
+        found[rec.get("key")] = rec.get("val") or rec.get("value") or ""
+    for k in keys:
+        if found.get(k):
+            return str(found[k])
+    return ""
+
+
+def _stamp_text(v) -> str:
+    """Display form of a meta timestamp: epoch seconds or a legacy text stamp."""
+    # meta.val is TEXT, so an int written there reads back as a digit string
+    if isinstance(v, str) and v.strip().isdigit():
+        v = int(v)
+    if isinstance(v, (int, float)):
+        return datetime.fromtimestamp(v).strftime("%Y-%m-%d %H:%M:%S")
+    return str(v or "")
+
+
 def set_last_indexed_now_for_root(db_path: str, root: str) -> str:
-    """Write/overwrite last_full_scan in meta, regardless of meta schema variant."""
-    dbp = index_db_path(root)
+    """
+    Upsert last_full_scan in meta and return the stamp written.
+    'value' is canonical; legacy 'val' is kept in sync in the same statement
+    because older readers still look there first.
+    """
+    dbp = db_path or index_db_path(root)
     _ensure_meta_schema(dbp)
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with open_sqlite(dbp) as c:
-        cur = c.cursor()
-        # prefer 'value'; keep 'val' updated too if that column exists
-        cols = {row[1] for row in cur.execute("PRAGMA table_info(meta)")}
-        if "value" in cols:
-            cur.execute(
-                "INSERT INTO meta(key,value) VALUES('last_full_scan', datetime('now','localtime'))"
-            )
-        if "val" in cols:
-            cur.execute(
-                "INSERT INTO meta(key,val) VALUES('last_full_scan', datetime('now',localtime))"
-            )
-        c.commit()
-
-
-"""def set_last_indexed_now_for_root(db_path: str, root: str):
-    with open_sqlite(db_path) as con:
-        con.execute(
-            "INSERT INTO meta(key,val) VALUES('last_full_scan', datetime('now','localtime')) "
-            "ON CONFLICT(key) DO UPDATE SET val=excluded.val"
+        cols = {row[1] for row in c.execute("PRAGMA table_info(meta)")}
+        targets = [col for col in ("value", "val") if col in cols]
+        c.execute(
+            f"INSERT INTO meta(key,{','.join(targets)}) "
+            f"VALUES('last_full_scan',{','.join('?' * len(targets))}) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            + ", ".join(f"{col}=excluded.{col}" for col in targets),
+            [stamp] * len(targets),
         )
-        con.commit()"""
+        c.commit()
+        # end of a scan: fold the WAL back so readers don't walk a long log
+        c.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    return stamp
 
 
 def get_last_indexed_text_for_root(root: str) -> str:
@@ -832,25 +991,18 @@ def get_last_indexed_text_for_root(root: str) -> str:
     if not os.path.exists(dbp):
         return "Never"
     try:
-        with open_sqlite_ro(dbp) as c:
-            cur = c.cursor()
-            # try value first
-            row = cur.execute(
-                "SELECT value FROM meta WHERE key IN ('last_full_scan','last_indexed') LIMIT 1"
-            ).fetchone()
-            if row and row[0]:
-                return row[0]
-            # fallback to val
-            row = cur.execute(
-                "SELECT val FROM meta WHERE key IN ('last_full_scan','last_indexed') LIMIT 1"
-            ).fetchone()
-            return row[0] if row and row[0] else "Never"
+        return _meta_text(open_sqlite_ro(dbp), "last_full_scan", "last_indexed") or "Never"
     except Exception:
         return "Never"
 
 
+# Trigram (SQLite 3.34+) indexes raw substrings, which is how part numbers are searched
+_FTS_TOKENIZE = "trigram" if sqlite3.sqlite_version_info >= (3, 34, 0) else "unicode61"
+
+
 def quickindex_rebuild_fts(db_path: str) -> None:
-    """Rebuild FTS index in the given DB; safe no-op if FTS not present."""
+    """Rebuild FTS index in the given DB; safe no-op if FTS not present.
+    Full re-tokenize: repair/migration only, the triggers keep it current otherwise."""
     try:
         with open_sqlite(db_path) as c:
             c.execute("INSERT INTO files_fts(files_fts) VALUES('rebuild')")
@@ -867,13 +1019,92 @@ def _qi_path():
     )
 
 
+# Per-thread connection pool keyed by mode + db path. A sqlite3 connection must
+# stay on the thread that opened it, so threading.local keeps every checkout on
+# its own thread; connections are opened with check_same_thread=False only so
+# _close_sqlite_pool can close them from the exiting thread. Callers may still
+# close(); a closed entry is simply replaced on the next checkout. Each pool is an
+# LRU capped at _SQLITE_POOL_MAX so a search across many roots can't pin every DB open.
+_SQLITE_POOL = threading.local()
+_SQLITE_POOL_MAX = 32
+# Every thread's pools, for the exit-time close. Weak values, so a finished
+# thread's pool (and its connections) still goes away with its thread-local.
+_SQLITE_POOLS = weakref.WeakValueDictionary()
+_SQLITE_POOLS_LOCK = threading.Lock()
+
+
+def _sqlite_pool(kind: str) -> OrderedDict:
+    pool = getattr(_SQLITE_POOL, kind, None)
+    if pool is None:
+        pool = OrderedDict()
+        setattr(_SQLITE_POOL, kind, pool)
+        with _SQLITE_POOLS_LOCK:
+            _SQLITE_POOLS[id(pool)] = pool
+    return pool
+
+
+def _sqlite_checkout(kind: str, db_path: str):
+    pool = _sqlite_pool(kind)
+    key = _normkey(db_path)  # "C:/x/idx.db" and "c:\\x\\idx.db" share one handle
+    con = pool.get(key)
+    if con is None:
+        return None
+    try:
+        con.execute("SELECT 1")  # raises if a caller closed it
+    except sqlite3.ProgrammingError:
+        pool.pop(key, None)
+        return None
+    pool.move_to_end(key)
+    con.row_factory = None  # undo per-caller tweaks
+    return con
+
+
+def _sqlite_checkin(kind: str, db_path: str, con: sqlite3.Connection) -> None:
+    pool = _sqlite_pool(kind)
+    pool[_normkey(db_path)] = con
+    for key in list(pool):
+        if len(pool) <= _SQLITE_POOL_MAX:
+            break
+        old = pool[key]
+        try:
+            if old.in_transaction:
+                continue  # never drop an indexer's open write
+            old.close()
+        except Exception:
+            pass
+        del pool[key]
+
+
+@atexit.register
+def _close_sqlite_pool():
+    """Close every thread's pooled connections, not just the exiting thread's."""
+    with _SQLITE_POOLS_LOCK:
+        pools = list(_SQLITE_POOLS.values())
+    for pool in pools:
+        for con in list(pool.values()):
+            try:
+                con.close()
+            except Exception:
+                pass
+        pool.clear()
+
+
 def open_sqlite(db_path: str) -> sqlite3.Connection:
-    con = sqlite3.connect(db_path, timeout=30)  # wait up to 30s if locked
+    con = _sqlite_checkout("rw", db_path)
+    if con is not None:
+        return con
+    # wait up to 30s if locked; check_same_thread: see the pool note above
+    con = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
     con.execute("PRAGMA busy_timeout = 10000")  # 10s internal wait
     # fewer locks; safe for readers
     con.execute("PRAGMA journal_mode = WAL")
     con.execute("PRAGMA synchronous = NORMAL")
     con.execute("PRAGMA temp_store = MEMORY")
+    # indexer is the heavy writer: bigger page cache, mmap reads, fewer checkpoints
+    con.execute("PRAGMA cache_size = -65536")  # 64 MB
+    con.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+    con.execute("PRAGMA wal_autocheckpoint = 10000")
+    _sqlite_checkin("rw", db_path, con)
     return con
 
 
@@ -881,9 +1112,19 @@ def open_sqlite_ro(db_path: str) -> sqlite3.Connection:
     """
     Read-only connection – safe while indexer is writing.
     """
-    con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30)
+    con = _sqlite_checkout("ro", db_path)
+    if con is not None:
+        return con
+    con = sqlite3.connect(
+        f"file:{db_path}?mode=ro", uri=True, timeout=30, check_same_thread=False
+    )
     con.execute("PRAGMA query_only = 1")
     con.execute("PRAGMA busy_timeout = 10000")
+    con.execute("PRAGMA mmap_size = 268435456")  # share the OS page mapping with the writer
+    # pooled for the life of the thread, so a warm page cache pays off across dialog refreshes
+    con.execute("PRAGMA cache_size = -65536")  # 64 MB
+    con.execute("PRAGMA temp_store = MEMORY")
+    _sqlite_checkin("ro", db_path, con)
     return con
 
 
@@ -894,23 +1135,28 @@ def ensure_quick_index_db(db_path: str) -> sqlite3.Connection:
     Returns an OPEN connection with WAL + busy timeouts (via open_sqlite).
     """
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    if not os.path.exists(db_path) or os.path.getsize(db_path) == 0:
+        # page_size is frozen once WAL is enabled, so stamp it on the empty file first
+        pre = sqlite3.connect(db_path)
+        try:
+            pre.execute("PRAGMA page_size = 8192")
+            pre.execute("VACUUM")
+        finally:
+            pre.close()
     con = open_sqlite(db_path)
     cur = con.cursor()
 
     # 1) meta table: keep both 'val' and 'value' for legacy code
-    cur.execute(
+    # 2) files table (new schema)
+    # one script, one schema-lock round trip
+    cur.executescript(
         """
         CREATE TABLE IF NOT EXISTS meta(
           key   TEXT PRIMARY KEY,
           val   TEXT,
           value TEXT
-        )
-    """
-    )
+        );
 
-    # 2) files table (new schema)
-    cur.execute(
-        """
         CREATE TABLE IF NOT EXISTS files(
           id       INTEGER PRIMARY KEY,
           root     TEXT,               -- drive or logical root label
@@ -923,7 +1169,7 @@ def ensure_quick_index_db(db_path: str) -> sqlite3.Connection:
           is_dir   INTEGER NOT NULL DEFAULT 0,
           parent   TEXT,               -- parent directory
           pass_id  INTEGER
-        )
+        );
     """
     )
 
@@ -958,52 +1204,57 @@ def ensure_quick_index_db(db_path: str) -> sqlite3.Connection:
         except sqlite3.OperationalError:
             pass
 
-    # 3) indices — prefer uniqueness by (root, path) so one DB can hold multiple logical roots if desired
-    cur.execute(
-        "CREATE UNIQUE INDEX IF NOT EXISTS ux_files_root_path ON files(root, path)"
-    )
-    cur.execute("CREATE INDEX IF NOT EXISTS ix_files_name   ON files(name)")
-    cur.execute("CREATE INDEX IF NOT EXISTS ix_files_ext    ON files(ext)")
-    cur.execute("CREATE INDEX IF NOT EXISTS ix_files_parent ON files(parent)")
-    cur.execute("CREATE INDEX IF NOT EXISTS ix_files_isdir  ON files(is_dir)")
-    cur.execute("CREATE INDEX IF NOT EXISTS ix_files_pass   ON files(pass_id)")
-    cur.execute(
-        "CREATE INDEX IF NOT EXISTS ix_files_name_nocase ON files(name COLLATE NOCASE)"
+    # 3) indices — prefer uniqueness by (root, path) so one DB can hold multiple logical roots if desired.
+    # is_dir is ~50/50 and nothing filters on it alone; ext only matters for files.
+    # searches list newest first (ORDER BY mtime DESC LIMIT n): ix_files_mtime lets them
+    # walk the index and stop at the limit instead of sorting every match in a temp B-tree
+    cur.executescript(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_files_root_path ON files(root, path);
+        CREATE INDEX IF NOT EXISTS ix_files_name   ON files(name);
+        CREATE INDEX IF NOT EXISTS ix_files_parent ON files(parent);
+        CREATE INDEX IF NOT EXISTS ix_files_pass   ON files(pass_id);
+        DROP INDEX IF EXISTS ix_files_isdir;
+        DROP INDEX IF EXISTS ix_files_ext;
+        CREATE INDEX IF NOT EXISTS ix_files_ext_files ON files(ext) WHERE is_dir = 0;
+        CREATE INDEX IF NOT EXISTS ix_files_name_nocase ON files(name COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS ix_files_mtime ON files(mtime);
+    """
     )
 
-    # 4) optional FTS (best-effort)
+    # 4) optional FTS (best-effort); kept in sync by the triggers below
     try:
+        row = cur.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='files_fts'"
+        ).fetchone()
+        migrate = bool(row) and f"'{_FTS_TOKENIZE}'" not in (row[0] or "")
+        if migrate:
+            # tokenizer changed: one-time drop + rebuild from the content table
+            cur.execute("DROP TABLE files_fts")
         cur.execute(
-            """
+            f"""
             CREATE VIRTUAL TABLE IF NOT EXISTS files_fts
-            USING fts5(name, path, content='files', content_rowid='id', tokenize='unicode61');
-        """
-        )
-        cur.execute(
-            """
-            CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files
-            BEGIN
-              INSERT INTO files_fts(rowid, name, path) VALUES (new.id, new.name, new.path);
-            END;
-        """
-        )
-        cur.execute(
-            """
-            CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE ON files
-            BEGIN
-              INSERT INTO files_fts(files_fts, rowid, name, path) VALUES ('delete', old.id, old.name, old.path);
-              INSERT INTO files_fts(rowid, name, path) VALUES (new.id, new.name, new.path);
-            END;
-        """
-        )
-        cur.execute(
-            """
-            CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files
-            BEGIN
-              INSERT INTO files_fts(files_fts, rowid, name, path) VALUES ('delete', old.id, old.name, old.path);
-            END;
+            USING fts5(name, path, content='files', content_rowid='id', tokenize='{_FTS_TOKENIZE}');
         """
         )
+        # a bulk pass that died before end_bulk_index() leaves FTS stale and untriggered
+        n_trig = cur.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name IN ('files_ai','files_au','files_ad')"
+        ).fetchone()[0]
+        if migrate or (row and n_trig < len(_FILES_FTS_TRIGGERS)):
+            cur.execute("INSERT INTO files_fts(files_fts) VALUES('rebuild')")
+        au = cur.execute(
+            "SELECT sql FROM sqlite_master WHERE type='trigger' AND name='files_au'"
+        ).fetchone()
+        if au and "WHEN" not in (au[0] or ""):
+            cur.execute("DROP TRIGGER files_au")  # pre-WHEN version; recreated below
+        for ddl in _FILES_FTS_TRIGGERS:
+            cur.execute(ddl)
+        # persistent rank: a hit in the file name outweighs one in its folder path
+        if not cur.execute("SELECT 1 FROM files_fts_config WHERE k = 'rank'").fetchone():
+            cur.execute(
+                "INSERT INTO files_fts(files_fts, rank) VALUES('rank', 'bm25(10.0, 1.0)')"
+            )
     except sqlite3.OperationalError:
         # FTS5 not compiled; that's fine
         pass
@@ -1012,6 +1263,71 @@ def ensure_quick_index_db(db_path: str) -> sqlite3.Connection:
     return con
 
 
+# Per-row FTS sync. A first full pass drops these (begin_bulk_index) and rebuilds once at the end.
+_FILES_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files
+    BEGIN
+      INSERT INTO files_fts(rowid, name, path) VALUES (new.id, new.name, new.path);
+    END;
+    """,
+    # the indexer's upsert rewrites every row each pass (pass_id, mtime); only a
+    # real name/path change needs the FTS delete+insert
+    """
+    CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE OF name, path ON files
+    WHEN old.name IS NOT new.name OR old.path IS NOT new.path
+    BEGIN
+      INSERT INTO files_fts(files_fts, rowid, name, path) VALUES ('delete', old.id, old.name, old.path);
+      INSERT INTO files_fts(rowid, name, path) VALUES (new.id, new.name, new.path);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files
+    BEGIN
+      INSERT INTO files_fts(files_fts, rowid, name, path) VALUES ('delete', old.id, old.name, old.path);
+    END;
+    """,
+)
+
+
+def begin_bulk_index(con: sqlite3.Connection) -> None:
+    """Drop the per-row FTS triggers and widen the page cache for a full pass."""
+    for name in ("files_ai", "files_au", "files_ad"):
+        con.execute(f"DROP TRIGGER IF EXISTS {name}")
+    con.execute("PRAGMA cache_size = -200000")  # ~200 MB while bulk-writing
+    con.commit()
+
+
+def end_bulk_index(con: sqlite3.Connection) -> None:
+    """Re-tokenize files_fts once from 'files', then restore the triggers."""
+    try:
+        con.execute("INSERT INTO files_fts(files_fts) VALUES('rebuild')")
+        for ddl in _FILES_FTS_TRIGGERS:
+            con.execute(ddl)
+    except sqlite3.OperationalError:
+        pass  # FTS5 not compiled: nothing to sync
+    con.execute("PRAGMA cache_size = -65536")  # back to open_sqlite's default
+    con.commit()
+
+
+# search-box tokens: "quoted phrases" or runs of non-space
+_QUERY_TOKEN_RE = re.compile(r'"[^"]+"|\S+')
+
+
+def _query_tokens(query) -> list[str]:
+    """Split a search-box query into tokens, quotes stripped (shared by the file providers)."""
+    toks = (t.strip('"') for t in _QUERY_TOKEN_RE.findall(str(query or "")))
+    return [t for t in toks if t.strip()]
+
+
+def _fts_in_sync(con: sqlite3.Connection) -> bool:
+    """files_fts exists and its triggers are live (a first full pass drops them until it ends)."""
+    row = con.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name IN ('files_fts', 'files_ai')"
+    ).fetchone()
+    return bool(row) and row[0] == 2
+
+
 def _fts_build_query(user_q: str, ordered: bool = False) -> str:
     """Turn 'coating* removal*' into 'coating* AND removal*' (FTS5 MATCH string).
     If ordered=True, treat as a phrase: '"coating removal"'.
@@ -1022,6 +1338,21 @@ def _fts_build_query(user_q: str, ordered: bool = False) -> str:
     tokens = [t for t in re.split(r"\s+", q) if t]
     if not tokens:
         return ""
+    if _FTS_TOKENIZE == "trigram":
+        # substrings are implicit, so only edge '*'s can be dropped. An inner '*'
+        # or any '?' needs LIKE's in-column ordering ('%abc%def%'), which split
+        # trigram pieces can't express; like pieces under 3 chars, those return ""
+        # and the caller takes its LIKE fallback
+        cores = [t.strip("*") for t in _query_tokens(q)]
+        if any("*" in c or "?" in c for c in cores):
+            return ""
+        if ordered:
+            pieces = [" ".join(cores)]
+        else:
+            pieces = [c for c in cores if c]
+        if not pieces or any(len(p) < 3 for p in pieces):
+            return ""
+        return " AND ".join('"' + p.replace('"', '""') + '"' for p in pieces)
     if ordered:
         phrase = " ".join([t.rstrip("*") for t in tokens])
         return f'"{phrase}"'
@@ -1039,33 +1370,17 @@ def get_index_db_path_for_root(root: str) -> str:
     Return the per-root DB path if your app uses one-DB-per-root; otherwise fall back
     to the single quick_index.sqlite if that’s your current layout.
     """
-    # Try per-root layout
-    idx_dir = os.path.join(
-        os.environ.get("LOCALAPPDATA", os.path.expanduser(r"~\AppData\Local")),
-        "PartSearch",
-        "index",
-    )
-    os.makedirs(idx_dir, exist_ok=True)
-    h = hashlib.sha1(root.encode("utf-8", errors="ignore")).hexdigest()[:12]
-    per_root = os.path.join(idx_dir, h, "index_db.sqlite")
+    # Try per-root layout (same canonical key + hash the indexer writes to)
+    per_root = index_db_path(root)
     if os.path.exists(per_root):
         return per_root
 
     # Fallback: single quick index (if that’s what you built)
-    qi = os.path.join(
-        os.environ.get("LOCALAPPDATA", os.path.expanduser(r"~\AppData\Local")),
-        "PartSearch",
-        "quick_index.sqlite",
-    )
-    return qi  # may or may not exist yet
+    return _qi_path()  # may or may not exist yet
 
 
 def _find_row_for_root(self, root: str):
-    for r in range(self.table.rowCount()):
-        item = self.table.item(r, 0)
-        if item and item.text() == root:
-            return r
-    return None
+    return self._row_for_path(root)
 
 
 # --- PN Search helpers ---
@@ -1105,21 +1420,144 @@ def _stringify_params(params):
             out[k] = v
     return out
 
+# --- REST result cache (cache-aside, per-user SQLite) ---
+# Denodo views refresh daily; a short TTL turns repeat searches into local reads.
+REST_CACHE_TTL_S = 15 * 60
+REST_CACHE_TTL_BY_VIEW = types.MappingProxyType({
+    ITEMS_VIEW: 60 * 60,
+    ITEM_CONTROLS: 60 * 60,
+})
+
+
+def _rest_cache_db() -> str:
+    return str(app_paths()["index_dir"] / "rest_cache.sqlite")
+
+
+def _rest_cache_ttl(url: str) -> int:
+    """TTL in seconds for a prepared URL; a 'rest_cache_ttl_s' pref overrides the defaults."""
+    try:
+        pref = _read_user_prefs().get("rest_cache_ttl_s")
+        if pref is not None:
+            return max(0, int(pref))
+    except Exception:
+        pass
+    view = (url or "").split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+    return REST_CACHE_TTL_BY_VIEW.get(view, REST_CACHE_TTL_S)
+
+
+def _rest_cache_key(url: str) -> str:
+    # the prepared URL already carries view + encoded params in a stable order
+    return hashlib.sha256((url or "").encode("utf-8")).hexdigest()
+
+
+# cache files whose table already exists this process; the DDL runs once per path
+_REST_CACHE_READY: set[str] = set()
+
+
+def _rest_cache_con() -> sqlite3.Connection:
+    db = _rest_cache_db()
+    con = open_sqlite(db)
+    if db not in _REST_CACHE_READY:
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rest_cache(
+              key         TEXT PRIMARY KEY,
+              inserted_at INTEGER NOT NULL,
+              ttl         INTEGER NOT NULL,
+              payload     BLOB NOT NULL
+            )
+            """
+        )
+        con.commit()
+        _REST_CACHE_READY.add(db)
+    return con
+
+
+def _rest_cache_get(url: str, ttl: int):
+    """Raw JSON bytes for a fresh entry, else None. Cache failures never break a fetch."""
+    if ttl <= 0:
+        return None
+    try:
+        row = _rest_cache_con().execute(
+            "SELECT inserted_at, payload FROM rest_cache WHERE key = ?",
+            (_rest_cache_key(url),),
+        ).fetchone()
+        if row and time.time() - row[0] < ttl:
+            return zlib.decompress(row[1])
+    except Exception:
+        pass
+    return None
+
+
+def _rest_cache_put(url: str, ttl: int, body: bytes) -> None:
+    if ttl <= 0 or not body:
+        return
+    try:
+        con = _rest_cache_con()
+        con.execute(
+            """
+            INSERT INTO rest_cache(key, inserted_at, ttl, payload) VALUES(?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+              inserted_at = excluded.inserted_at,
+              ttl = excluded.ttl,
+              payload = excluded.payload
+            """,
+            (_rest_cache_key(url), int(time.time()), ttl, zlib.compress(body, 6)),
+        )
+        # opportunistic purge so the file doesn't grow without bound
+        con.execute("DELETE FROM rest_cache WHERE inserted_at + ttl < ?", (int(time.time()),))
+        con.commit()
+    except Exception:
+        pass
+
+
+def _denodo_rows(data):
+    """The "elements" row list of a Denodo payload, or None when it has none (e.g. an error body)."""
+    if isinstance(data, list) and data and isinstance(data[0], dict) and "elements" in data[0]:
+        data = data[0]  # list-of-wrappers payload: the legacy path read only the first
+    rows = data.get("elements") if isinstance(data, dict) else None
+    return rows if isinstance(rows, list) else None
+
+
+def _normalize_denodo_payload(data) -> pd.DataFrame:
+    """Denodo wraps rows as {"elements": [...]}; rows are flat, so build the frame directly."""
+    rows = _denodo_rows(data)
+    if rows is not None:
+        if rows and isinstance(rows[0], dict) and any(isinstance(v, dict) for v in rows[0].values()):
+            df = pd.json_normalize(rows)  # nested records still need flattening
+        else:
+            df = pd.DataFrame.from_records(rows)
+    else:
+        try:
+            df = pd.json_normalize(data)
+        except Exception:
+            df = pd.DataFrame()
+    return normalize_keys(df if isinstance(df, pd.DataFrame) else pd.DataFrame())
+
+
 def _send_and_normalize(sess, prepped, original_req, timeout, max_retries):
+    ttl = _rest_cache_ttl(prepped.url) if prepped.method == "GET" else 0
+    cached = _rest_cache_get(prepped.url, ttl)
+    if cached is not None:
+        try:
+            return _normalize_denodo_payload(_json_loads(cached))
+        except Exception:
+            pass
     for attempt in range(max_retries):
         try:
             resp = sess.send(prepped, verify=False, timeout=timeout)
             resp.raise_for_status()
             try:
-                data = resp.json()
+                data = _json_loads(resp.content)
             except Exception:
                 return pd.DataFrame()
-            try:
-                df = pd.json_normalize(pd.json_normalize(data)["elements"][0])
-            except Exception:
-                df = pd.json_normalize(data)
-            return normalize_keys(df if isinstance(df, pd.DataFrame) else pd.DataFrame())
+            if _denodo_rows(data) is not None:
+                # a 200 can still carry a Denodo error body; never replay that
+                _rest_cache_put(prepped.url, ttl, resp.content)
+            return _normalize_denodo_payload(data)
         except requests.exceptions.ConnectionError as e:
+            # connect/read retries already ran in the session's urllib3 Retry; a
+            # keep-alive socket the server dropped earns one fresh session
             if attempt == 0 and ("RemoteDisconnected" in str(e) or "closed connection" in str(e)):
                 try:
                     global _D_SESSION
@@ -1129,9 +1567,6 @@ def _send_and_normalize(sess, prepped, original_req, timeout, max_retries):
                     continue
                 except Exception:
                     pass
-            if attempt < max_retries - 1:
-                time.sleep((2**attempt) + random.random())
-                continue
             raise RuntimeError(_with_tip(f"Denodo connection error: {e}")) from e
         except requests.HTTPError as e:
             try:
@@ -1140,11 +1575,9 @@ def _send_and_normalize(sess, prepped, original_req, timeout, max_retries):
             except Exception:
                 status = None
                 body = ""
-            transient = (
-                (status and 500 <= status <= 599)
-                or ("ORA-01033" in body)
-                or ("CONNECTION_ERROR" in body)
-            )
+            # 429/5xx were already retried with backoff by the adapter; only Denodo's
+            # "source still starting" bodies are worth another round on top
+            transient = ("ORA-01033" in body) or ("CONNECTION_ERROR" in body)
             if transient and attempt < max_retries - 1:
                 time.sleep((2**attempt) + random.random())
                 continue
@@ -1153,9 +1586,6 @@ def _send_and_normalize(sess, prepped, original_req, timeout, max_retries):
                 f"Denodo request failed: HTTP {status}\nURL: {short_url}\nBody: {body}"
             )) from e
         except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep((2**attempt) + random.random())
-                continue
             short_url = _shorten(prepped.url, keep=240)
             raise RuntimeError(_with_tip(f"Denodo request error: {e}\nURL: {short_url}")) from e
 
@@ -1191,6 +1621,14 @@ def _sql_quote(v: str) -> str:
     s = str(v).replace("'", "''")
     return f"'{s}'"
 
+
+def _sql_in_list(values) -> str:
+    """Body of an IN (...) list, e.g. 'a', 'b'; one join instead of a concat per value.
+    str.replace beats str.translate here (the translate table maps to a 2-char string:
+    ~10x slower on 200 IDs), so quote-doubling stays on replace everywhere."""
+    vals = [str(v).replace("'", "''") for v in values]
+    return "'" + "', '".join(vals) + "'" if vals else ""
+
 def _strip_field_predicates_from_filter(filter_text: str, fields: list[str]) -> str:
     """
     Remove predicates on any of the given fields from a $filter string.
@@ -1299,24 +1737,24 @@ def denodo_fetch_all_safe(
     use_qualified = ("IM." in base_filter) or (re.search(r"\bIM\.", base_filter) is not None)
     inject_field = filter_field_qualified if use_qualified else filter_field
 
-    dfs = []
+    # Strip any existing item_id predicates (qualified or unqualified)
+    cleaned_filter = _strip_field_predicates_from_filter(
+        base_filter,
+        fields=[filter_field, filter_field_qualified]
+    )
+
     current_chunk_size = max(5, int(chunk_size))
     while True:
         try:
+            prepared = []
             for chunk in _iter_chunks(candidate_vals, current_chunk_size):
                 chunk_params = dict(base_params)
 
                 # Remove the separate item_id param to avoid duplicates
                 chunk_params.pop(candidate_key, None)
 
-                # Strip any existing item_id predicates (qualified or unqualified)
-                cleaned_filter = _strip_field_predicates_from_filter(
-                    base_filter,
-                    fields=[filter_field, filter_field_qualified]
-                )
-
                 # Build IN(...) with proper quoting to preserve leading zeros
-                in_list = ", ".join(_sql_quote(x) for x in chunk)
+                in_list = _sql_in_list(chunk)
                 in_pred = f"{inject_field} IN ({in_list})"
 
                 # Compose the new $filter
@@ -1331,10 +1769,7 @@ def denodo_fetch_all_safe(
                 prepped = sess.prepare_request(req)
                 if _safe_url_len(prepped) > url_len_limit:
                     raise ValueError("chunk_too_large")
-
-                df_part = _send_and_normalize(sess, prepped, req, timeout, max_retries)
-                if isinstance(df_part, pd.DataFrame) and not df_part.empty:
-                    dfs.append(df_part)
+                prepared.append((prepped, req))
             break
         except ValueError as ve:
             if str(ve) == "chunk_too_large":
@@ -1347,6 +1782,18 @@ def denodo_fetch_all_safe(
                 continue
             raise
 
+    # Chunks are independent GETs: send them concurrently over the pooled session.
+    # map() keeps chunk order, so drop_duplicates(keep="first") stays deterministic.
+    def _send(pr):
+        return _send_and_normalize(sess, pr[0], pr[1], timeout, max_retries)
+
+    if len(prepared) == 1:
+        parts = [_send(prepared[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(DENODO_MAX_WORKERS, len(prepared))) as ex:
+            parts = list(ex.map(_send, prepared))
+    dfs = [d for d in parts if isinstance(d, pd.DataFrame) and not d.empty]
+
     if not dfs:
         return pd.DataFrame()
 
@@ -1371,30 +1818,37 @@ def denodo_fetch_all(url, headers, params):
     )
 
 def _fetch_in_chunks(view_name, id_col, ids, headers, select_cols, chunk_size=150):
-    frames = []
-    for i in range(0, len(ids), chunk_size):
-        batch = ids[i : i + chunk_size]
-        ids_in = ", ".join("'" + x.replace("'", "''") + "'" for x in batch)
-        params = {
-            "$select": ",".join(select_cols),
-            "$filter": f"({id_col} IN ({ids_in}))",
-        }
-        df = denodo_fetch_all_safe(f"{BASE_URL}/{view_name}", headers, params)
-        df = normalize_keys(df if isinstance(df, pd.DataFrame) else pd.DataFrame())
-        frames.append(df)
+    select = ",".join(select_cols)
+
+    def _params_for(batch):
+        ids_in = _sql_in_list(batch)
+        return {"$select": select, "$filter": f"({id_col} IN ({ids_in}))"}
+
+    def _fetch(batch):
+        df = denodo_fetch_all_safe(f"{BASE_URL}/{view_name}", headers, _params_for(batch))
+        return _as_frame(df)
+
+    batches = [ids[i : i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    if len(batches) <= 1:
+        frames = [_fetch(b) for b in batches]
+    else:
+        # independent GETs over the pooled session; map() keeps chunk order
+        with ThreadPoolExecutor(max_workers=min(DENODO_MAX_WORKERS, len(batches))) as ex:
+            frames = list(ex.map(_fetch, batches))
     return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
 
 def extract_pn_candidates(text: str):
     c = set()
-    for pat in PN_REGEXES:
-        for m in re.findall(pat, text or "", flags=re.I):
-            c.add(m.upper())
-    for tok in re.split(r"[^\w\-\.]+", text or ""):
+    if text and _PN_ANY.search(text):
+        for pat in _PN_PATTERNS:
+            for m in pat.findall(text):
+                c.add(m.upper())
+    for tok in _PN_TOKEN_SPLIT.split(text or ""):
         t = tok.strip().upper()
         if t and any(ch.isdigit() for ch in t) and len(t) >= 4:
             c.add(t)
-    return sorted(c, key=lambda s: (-len(s), sum(ch.isdigit() for ch in s)))
+    return sorted(c, key=lambda s: (-len(s), len(s) - len(s.translate(_DROP_DIGITS))))
 
 
 def choose_one_pn(parent, candidates):
@@ -1408,16 +1862,35 @@ def choose_one_pn(parent, candidates):
     return pn if ok else None
 
 
-def file_search_enabled() -> bool:
-    """Read policy gate; if anything fails, default to enabled."""
+def _read_policy() -> dict:
+    """Machine policy.json as a dict; {} if it is missing or unreadable."""
     try:
         pdir = os.environ.get("PROGRAMDATA", r"C:\ProgramData")
         p = os.path.join(pdir, "PartSearch", "policy.json")
         with open(p, "r", encoding="utf-8") as f:
             pol = json.load(f)
-        return bool(pol.get("file_search_enabled", True))
+        return pol if isinstance(pol, dict) else {}
     except Exception:
-        return True
+        return {}
+
+
+def file_search_enabled() -> bool:
+    """Read policy gate; if anything fails, default to enabled."""
+    return bool(_read_policy().get("file_search_enabled", True))
+
+
+def index_sync_off_enabled() -> bool:
+    """Policy opt-in for synchronous=OFF while indexing (faster, unsafe on power loss). Default off."""
+    return bool(_read_policy().get("index_sync_off", False))
+
+
+def index_scan_workers() -> int:
+    """Concurrent directory listings per indexed root (policy: index_scan_workers, 1 = serial walk)."""
+    try:
+        n = int(_read_policy().get("index_scan_workers", 8))
+    except (TypeError, ValueError):
+        n = 8
+    return max(1, min(n, 32))
 
 
 # ------------ Location picking helpers (module level) ------------
@@ -1428,21 +1901,33 @@ def _list_candidate_roots():
     Discover useful starting points: fixed drives, mapped network drives,
     and common OneDrive/SharePoint sync folders.
     """
+    # 60 s buckets: reopening the picker skips the drive/home probes, a newly
+    # mapped drive still shows up within a minute
+    return list(_list_candidate_roots_cached(int(time.monotonic() // 60)))
+
+
+def _is_sync_folder_name(name: str) -> bool:
+    """OneDrive* / *SharePoint* profile folder; case-insensitive like the Windows globs it replaced."""
+    n = name.casefold()
+    return n.startswith("onedrive") or "sharepoint" in n
+
+
+@functools.lru_cache(maxsize=1)
+def _list_candidate_roots_cached(_bucket: int) -> tuple:
     roots = []
 
     # 1) Logical Windows drives (fixed + network)
     # DRIVE types
     DRIVE_UNKNOWN = 0
-    DRIVE_NO_ROOT_DIR = 1
-    DRIVE_REMOVABLE = 2
     DRIVE_FIXED = 3
     DRIVE_REMOTE = 4
     kernel32 = ctypes.windll.kernel32
-    buf = ctypes.create_unicode_buffer(256)
-    kernel32.GetLogicalDriveStringsW(ctypes.sizeof(buf) // 2, buf)
-    for d in buf.value.split("\x00"):
-        if not d:
+    mask = kernel32.GetLogicalDrives()
+    # A:/B: are floppy letters; probing them can stall on legacy hardware
+    for i in range(2, 26):
+        if not mask & (1 << i):
             continue
+        d = f"{chr(ord('A') + i)}:\\"
         try:
             dtype = kernel32.GetDriveTypeW(d)
         except Exception:
@@ -1456,10 +1941,17 @@ def _list_candidate_roots():
     # Typical OneDrive env
     if os.environ.get("OneDrive"):
         candidates.append(os.environ["OneDrive"])
-    # Common OneDrive org folders: "OneDrive - OrgName"
-    candidates += glob.glob(os.path.join(home, "OneDrive*"))
-    # SharePoint libraries via OneDrive client tend to live under the org folder too
-    candidates += glob.glob(os.path.join(home, "*SharePoint*"))
+    # Common OneDrive org folders ("OneDrive - OrgName") and SharePoint libraries:
+    # one pass over ~ instead of a glob enumeration per pattern
+    try:
+        with os.scandir(home) as it:
+            candidates += sorted(
+                e.path
+                for e in it
+                if _is_sync_folder_name(e.name) and e.is_dir()
+            )
+    except OSError:
+        pass
     for c in candidates:
         if os.path.isdir(c):
             roots.append(c)
@@ -1472,7 +1964,7 @@ def _list_candidate_roots():
         if r not in seen:
             seen.add(r)
             uniq.append(r)
-    return uniq
+    return tuple(uniq)
 
 
 # ===== FileSearch: Locations filter dialog =====
@@ -1500,16 +1992,12 @@ class SearchLocationsDialog(QDialog):
 
     def _load_json(self, path, default):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return _read_json_cached(path)
         except Exception:
             return default
 
     def _save_json(self, path, obj):
-        tmp = path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(obj, f, indent=2)
-        os.replace(tmp, path)
+        _atomic_write_json(path, obj)
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
@@ -1710,7 +2198,7 @@ def ensure_index_db(dbpath: str):
     Also makes the 'meta' table compatible with both 'val' and 'value' writes.
     """
     os.makedirs(os.path.dirname(dbpath), exist_ok=True)
-    conn = open_sqlite_ro(dbpath)  # <-- use the actual parameter name
+    conn = open_sqlite(dbpath)  # DDL needs a writable connection
     try:
         cur = conn.cursor()
         cur.executescript(
@@ -1734,11 +2222,11 @@ def ensure_index_db(dbpath: str):
                 val   TEXT,
                 value TEXT
             );
+            CREATE INDEX IF NOT EXISTS idx_files_name ON files(name);
+            CREATE INDEX IF NOT EXISTS idx_files_ext  ON files(ext);
+            CREATE INDEX IF NOT EXISTS idx_files_dir  ON files(dir);
         """
         )
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_files_name ON files(name);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_files_ext  ON files(ext);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_files_dir  ON files(dir);")
         conn.commit()
     finally:
         conn.close()
@@ -1748,9 +2236,7 @@ def get_last_indexed_text(root):
     db = get_index_db_path(root)  # your helper
     if not os.path.exists(db):
         return "Never"
-    with open_sqlite_ro(db) as c:
-        val = c.execute("SELECT value FROM meta WHERE key='last_indexed'").fetchone()
-    return val[0] if val and val[0] else "Unknown"
+    return _meta_text(open_sqlite_ro(db), "last_indexed") or "Unknown"
 
 
 def classify_ext(path: str) -> str:
@@ -1812,12 +2298,24 @@ def _prefs_paths():
 
 def _read_json(path: str):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _read_json_cached(path)
     except Exception:
         return None
 
 
+def _stat_sig(path: str):
+    """(mtime_ns, size) of path, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Merged prefs keyed on both source files' stat; re-merged only when either changes.
+_PREFS_CACHE: dict = {}
+
+
 def _deep_merge(a: dict, b: dict) -> dict:
     """Shallow for lists, recursive for dicts."""
     out = dict(a or {})
@@ -1838,6 +2336,11 @@ def _prefs_read() -> dict:
     User overrides win.
     """
     machine_path, user_path = _prefs_paths()
+    sig = (_stat_sig(machine_path), _stat_sig(user_path))
+    with _JSON_CACHE_LOCK:
+        hit = _PREFS_CACHE.get("prefs")
+    if hit is not None and hit[0] == sig:
+        return copy.deepcopy(hit[1])
 
     base = copy.deepcopy(DEFAULT_PREFS)
     machine = _read_json(machine_path) or {}
@@ -1860,7 +2363,9 @@ def _prefs_read() -> dict:
     prefs["ui"].setdefault("geometry", None)
     prefs["ui"].setdefault("last_tab", "psft")
 
-    return prefs
+    with _JSON_CACHE_LOCK:
+        _PREFS_CACHE["prefs"] = (sig, prefs)
+    return copy.deepcopy(prefs)
 
 
 def _prefs_write(prefs: dict) -> bool:
@@ -1877,14 +2382,16 @@ def _prefs_write(prefs: dict) -> bool:
             "filter_defaults": prefs.get("filter_defaults", {}),
             "ui": prefs.get("ui", {}),
         }
-        tmp = user_path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(to_store, f, indent=2)
-        os.replace(tmp, user_path)
+        _atomic_write_json(user_path, to_store)
         return True
     except Exception as e:
         print("prefs write error:", e)
         return False
+    finally:
+        # two writes in one mtime tick with the same size keep the stat signature,
+        # so don't let _prefs_read trust it after a write
+        with _JSON_CACHE_LOCK:
+            _PREFS_CACHE.pop("prefs", None)
 
 
 def get_saved_roots(key: str) -> list:
@@ -1923,12 +2430,9 @@ def indexed_file_count_for_root(root: str) -> int:
         dbp = index_db_path(root)
         if not os.path.exists(dbp):
             return 0
-        con = open_sqlite_ro(dbp)
-        try:
-            row = con.execute("SELECT COUNT(*) FROM files").fetchone()
-            return int(row[0] if row else 0)
-        finally:
-            con.close()
+        con = open_sqlite_ro(dbp)  # pooled; stays open for the next call
+        row = con.execute("SELECT COUNT(*) FROM files").fetchone()
+        return int(row[0] if row else 0)
     except Exception:
         return 0
 
@@ -1938,19 +2442,8 @@ def last_full_scan_for_root(root: str) -> str | None:
         dbp = index_db_path(root)
         if not os.path.exists(dbp):
             return ""
-        con = open_sqlite_ro(dbp)
-        try:
-            row = con.execute(
-                "SELECT val FROM meta WHERE key='last_full_scan'"
-            ).fetchone()
-            if row and row[0]:
-                return str(row[0])
-            row = con.execute(
-                "SELECT value FROM meta WHERE key='last_full_scan'"
-            ).fetchone()
-            return str(row[0]) if row and row[0] else ""
-        finally:
-            con.close()
+        con = open_sqlite_ro(dbp)  # pooled; stays open for the next call
+        return _meta_text(con, "last_full_scan")
     except Exception:
         return ""
 
@@ -1968,94 +2461,130 @@ def enovia_db_path():
     return os.path.join(base, "enovia_index.sqlite")
 
 
+# Clustered on the PK: a rowid table would store every row twice (table + PK index)
+_ENOVIA_DDL = """
+  CREATE TABLE IF NOT EXISTS {name} (
+    id       TEXT,
+    name     TEXT,
+    type     TEXT,
+    rev      TEXT,
+    state    TEXT,
+    modified TEXT,
+    url      TEXT,
+    last_seen REAL,
+    PRIMARY KEY(url, name, type, rev)
+  ) WITHOUT ROWID
+"""
+
+
 def ensure_enovia_db():
     p = enovia_db_path()
     conn = open_sqlite(p)
     conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute(
-        """
-      CREATE TABLE IF NOT EXISTS enovia (
-        id       TEXT,
-        name     TEXT,
-        type     TEXT,
-        rev      TEXT,
-        state    TEXT,
-        modified TEXT,
-        url      TEXT,
-        last_seen REAL,
-        PRIMARY KEY(url, name, type, rev)
-      )
-    """
-    )
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='enovia'"
+    ).fetchone()
+    if row and "WITHOUT ROWID" not in (row[0] or "").upper():
+        # one-time copy of a legacy rowid table; WITHOUT ROWID keys must be NOT NULL
+        with conn:
+            conn.execute(_ENOVIA_DDL.format(name="enovia_new"))
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO enovia_new
+                SELECT id, COALESCE(name, ''), COALESCE(type, ''), COALESCE(rev, ''),
+                       state, modified, COALESCE(url, ''), last_seen
+                FROM enovia
+                """
+            )
+            conn.execute("DROP TABLE enovia")
+            conn.execute("ALTER TABLE enovia_new RENAME TO enovia")
+    conn.execute(_ENOVIA_DDL.format(name="enovia"))
     conn.execute("""CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, val TEXT)""")
     return conn
 
 
-def enovia_ingest_csv(path: str):
+# Accepted header spellings per enovia column, in preference order
+_ENOVIA_CSV_COLUMNS = (
+    ("ID", "Object Id", "ObjectId", "OID"),
+    ("Name", "Title", "File Name", "FileName", "DrawingNo", "Drawing No"),
+    ("Type", "Format", "Object Type"),
+    ("Revision", "Rev"),
+    ("State",),
+    ("Modified", "Last Modified", "LastModified"),
+    ("URL", "Link", "Href", "Download URL"),
+)
+
+
+def enovia_ingest_csv(path: str, batch: int = 500):
     """Read an ENOVIA export CSV and upsert rows into the local ENOVIA index."""
     conn = ensure_enovia_db()
     now = time.time()
+    sql = """
+      INSERT OR REPLACE INTO enovia(id,name,type,rev,state,modified,url,last_seen)
+      VALUES (?,?,?,?,?,?,?,?)
+    """
     try:
-        try:
-            df = pd.read_csv(path, encoding="utf-8", engine="python")
-        except Exception:
-            df = pd.read_csv(path, encoding="utf-8", engine="python", sep=";")
-
-        def pick(*names):
-            for n in names:
-                if n in df.columns:
-                    return df[n]
-            return pd.Series([""] * len(df))
-
-        recs = zip(
-            pick("ID", "Object Id", "ObjectId", "OID").astype(str),
-            pick(
-                "Name", "Title", "File Name", "FileName", "DrawingNo", "Drawing No"
-            ).astype(str),
-            pick("Type", "Format", "Object Type").astype(str),
-            pick("Revision", "Rev").astype(str),
-            pick("State").astype(str),
-            pick("Modified", "Last Modified", "LastModified").astype(str),
-            pick("URL", "Link", "Href", "Download URL").astype(str),
-        )
-        cur = conn.cursor()
-        for oid, name, typ, rev, state, mod, url in recs:
-            cur.execute(
-                """
-              INSERT OR REPLACE INTO enovia(id,name,type,rev,state,modified,url,last_seen)
-              VALUES (?,?,?,?,?,?,?,?)
-            """,
-                (
-                    oid.strip(),
-                    name.strip(),
-                    typ.strip(),
-                    rev.strip(),
-                    state.strip(),
-                    mod.strip(),
-                    url.strip(),
-                    now,
-                ),
-            )
+        # stream with the C csv reader instead of materializing a DataFrame
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            head = f.readline()
+            f.seek(0)
+            delim = ";" if head.count(";") > head.count(",") else ","
+            reader = csv.reader(f, delimiter=delim)
+            header = [h.strip() for h in next(reader, [])]
+            pos = {h: i for i, h in reversed(list(enumerate(header)))}
+            idx = [
+                next((pos[n] for n in names if n in pos), None)
+                for names in _ENOVIA_CSV_COLUMNS
+            ]
+            cur = conn.cursor()
+            # one write transaction for the whole file: a single WAL commit instead of
+            # one per batch, and the write lock is taken up front rather than mid-ingest
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            rows = []
+            for rec in reader:
+                if not rec:
+                    continue
+                n = len(rec)
+                rows.append(
+                    tuple(
+                        rec[i].strip() if i is not None and i < n else ""
+                        for i in idx
+                    )
+                    + (now,)
+                )
+                if len(rows) >= batch:
+                    cur.executemany(sql, rows)
+                    rows.clear()
+            if rows:
+                cur.executemany(sql, rows)
         conn.execute(
             "INSERT OR REPLACE INTO meta(key,val) VALUES ('last_full_scan', ?)",
-            (time.strftime("%Y-%m-%d %H:%M:%S"),),
+            (int(time.time()),),  # epoch seconds; _stamp_text formats for display
         )
         conn.commit()
+    except Exception:
+        conn.rollback()  # leave the previous import intact
+        raise
     finally:
         conn.close()
 
 
 # --- Normalize incoming part numbers from CSV ---
 SOLIDWORKS_EXTS = (".sldprt", ".sldasm", ".slddrw")
+# Trailing SolidWorks extension (case-insensitive); compiled once for CSV-sized loops
+_SW_EXT_RE = re.compile(r"\.(?:sldprt|sldasm|slddrw)\Z", re.IGNORECASE)
 
 
 def normalize_part(p: str) -> str:
     """Uppercase PN and strip soldiworks extensions/whitespace"""
-    s = str(p).strip()
-    # remove SolidWorks file extensions (case-insensitive)
-    s = re.sub(r"\.(sldprt|sldasm|slddrw)$", "", s, flags=re.IGNORECASE)
     # uppercase because the backend and joins are normalized to upper
-    return s.upper()
+    return _SW_EXT_RE.sub("", str(p).strip()).upper()
+
+
+def normalize_part_series(s: pd.Series) -> pd.Series:
+    """Vectorized normalize_part for a whole column."""
+    return s.astype(str).str.strip().str.replace(_SW_EXT_RE, "", regex=True).str.upper()
 
 
 def normalize_status_key(s) -> str:
@@ -2067,9 +2596,14 @@ def normalize_bu(df):
     """Ensure a 'BU' string column is present; do NOT drop NULLs."""
     if "BU" not in df.columns and "business_unit" in df.columns:
         df = df.rename(columns={"business_unit": "BU"})
-    df["BU"] = df.get("BU", "").astype(str)
-    # keep blanks as blanks for filtering; you can label for display later
-    df["BU"] = df["BU"].replace({"nan": "", "None": ""}).fillna("")
+    if "BU" not in df.columns:
+        df["BU"] = ""
+        return df
+    # keep blanks as blanks for filtering; you can label for display later.
+    # One pass: stringify, and blank the str() of NaN/None (what astype(str) produced)
+    df["BU"] = [
+        "" if s in ("nan", "None") else s for s in map(str, df["BU"].to_numpy())
+    ]
     return df
 
 #Added by Ajay on 11 Feb 2026
@@ -2131,20 +2665,30 @@ def apply_bu_filter(df, bus, include_unassigned=True):
     return df[mask]
 
 
+@functools.lru_cache(maxsize=256)
+def _qcode_token_re(qc: str):
+    """Match qc as a whole token in a ' ,;|'-separated q_codes string."""
+    return re.compile(rf"(^|[ ,;|]){re.escape(qc)}([ ,;|]|$)")
+
+
 def apply_qcode_filter(df: pd.DataFrame, qcodes: list[str] | None):
     if not qcodes:
         return df
-    import re
 
-    # normalize input & column
-    qcodes = [q.strip().upper() for q in qcodes if str(q).strip()]
-    series = df.get("q_codes", "").fillna("").astype(str).str.upper()
-    # each requested code must appear (token-aware)
-    mask = pd.Series(True, index=df.index)
-    for qc in qcodes:
-        pat = rf"(^|[ ,;|]){re.escape(qc)}([ ,;|]|$)"
-        mask &= series.str.contains(pat, regex=True)
-    return df[mask]
+    # normalize input & column; longest code first, as it is the most selective
+    codes = sorted({str(q).strip().upper() for q in qcodes if str(q).strip()}, key=len, reverse=True)
+    if "q_codes" not in df.columns:
+        return df.iloc[0:0] if codes else df
+    vals = df["q_codes"].fillna("").astype(str).str.upper().to_numpy()
+    # each requested code must appear (token-aware); later codes only scan the
+    # rows that survived the earlier ones
+    keep = range(len(vals))
+    for qc in codes:
+        pat = _qcode_token_re(qc)
+        keep = [i for i in keep if pat.search(vals[i])]
+        if not keep:
+            break
+    return df.iloc[list(keep)]
 
 
 def q_like(field: str, value: str) -> str:
@@ -2162,33 +2706,45 @@ def _q_escape(s: str) -> str:
     return str(s).replace("'", "''")
 
 
+# UI wildcards -> SQL LIKE in one translate: * -> %   and   ? -> _
+_WILD_TRANS = str.maketrans({"*": "%", "?": "_"})
+
+
+def _like_ci_pat(term: str) -> str:
+    raw = (_q_escape(term or "")).strip()
+    pat = raw.translate(_WILD_TRANS)
+    # if the user didn't include any %/_ at all, do a contains search
+    if "%" not in pat and "_" not in pat:
+        pat = f"%{pat}%"
+    return pat.upper()
+
+
 def q_like_ci(field: str, term: str) -> str:
     """
     Case-insensitive LIKE with user wildcards:
     * -> %   and   ? -> _
     Always does a contains match unless the user already supplied %/_.
     """
-    raw = (_q_escape(term or "")).strip()
-    # translate UI wildcards to SQL LIKE
-    pat = raw.replace("*", "%").replace("?", "_")
-    # if the user didn't include any %/_ at all, do a contains search
-    if "%" not in pat and "_" not in pat:
-        pat = f"%{pat}%"
-    return f"upper({field}) LIKE '{pat.upper()}'"
+    return f"upper({field}) LIKE '{_like_ci_pat(term)}'"
+
+
+def _likes_ci(field: str, terms, sep: str) -> str:
+    field_u = f"upper({field})"
+    return sep.join(f"{field_u} LIKE '{_like_ci_pat(t)}'" for t in terms)
 
 
 def q_or_like_ci(field: str, terms) -> str:
     terms = [t for t in (terms or []) if str(t).strip()]
     if not terms:
         return ""
-    return "(" + " OR ".join(q_like_ci(field, t) for t in terms) + ")"
+    return "(" + _likes_ci(field, terms, " OR ") + ")"
 
 
 def q_and_like_ci(field: str, terms) -> str:
     terms = [t for t in (terms or []) if str(t).strip()]
     if not terms:
         return ""
-    return " AND ".join(q_like_ci(field, t) for t in terms)
+    return _likes_ci(field, terms, " AND ")
 
 
 def q_either_or_ci(field: str, groups) -> str:
@@ -2196,13 +2752,14 @@ def q_either_or_ci(field: str, groups) -> str:
     for grp in groups or []:
         grp = [t for t in grp if str(t).strip()]
         if grp:
-            parts.append("(" + " OR ".join(q_like_ci(field, t) for t in grp) + ")")
+            parts.append("(" + _likes_ci(field, grp, " OR ") + ")")
     return " AND ".join(parts)
 
 
 def q_in_ci(field: str, seq) -> str:
-    vals = [f"'{_q_escape(x).upper()}'" for x in (seq or []) if str(x).strip()]
-    return f"upper({field}) in ({', '.join(vals)})" if vals else ""
+    # one join, then a single upper() over the whole list body
+    vals = _sql_in_list(x for x in (seq or []) if str(x).strip())
+    return f"upper({field}) in ({vals.upper()})" if vals else ""
 
 
 def _ensure_tuple3(result):
@@ -2222,6 +2779,10 @@ def _ensure_tuple3(result):
         return (empty, empty, empty)
 
 
+# Any SQL/user wildcard: % _ * ?
+_LIKE_WILDCARDS = re.compile(r"[%_*?]")
+
+
 def build_itemmaster_filter_parts(
     item_ids=None,
     mfg_parts=None,
@@ -2259,8 +2820,9 @@ def build_itemmaster_filter_parts(
     # A) ID predicates
     id_bits = []
     if item_ids:
-        likes = [x for x in item_ids if any(ch in x for ch in ("%", "_", "*", "?"))]
-        eqs = [x for x in item_ids if not any(ch in x for ch in ("%", "_", "*", "?"))]
+        likes, eqs = [], []
+        for x in item_ids:
+            (likes if _LIKE_WILDCARDS.search(x) else eqs).append(x)
         if eqs:
             if len(eqs) == 1:
                 id_bits.append(f"UPPER(item_id) = '{_q_escape(eqs[0]).upper()}'")
@@ -2344,6 +2906,17 @@ def fx_convert(
 
 # ---- Build Filters & Equivalent SQL ----
 
+# appended inside the BU clause when "Include unassigned" is on
+_BU_UNASSIGNED_SUFFIX = " OR business_unit IS NULL OR TRIM(business_unit)=''"
+
+
+def _bu_clause(bus, include_unassigned: bool) -> str:
+    """Case-insensitive BU IN-list, optionally widened to NULL/blank BUs."""
+    clause = q_in_ci("business_unit", bus)
+    if clause and include_unassigned:
+        return f"({clause}{_BU_UNASSIGNED_SUFFIX})"
+    return clause
+
 
 def build_item_filters(self) -> str:
     """
@@ -2361,12 +2934,9 @@ def build_item_filters(self) -> str:
         getattr(self, "chk_include_unassigned", None)
         and self.chk_include_unassigned.isChecked()
     )
-    if bu_list:
-        in_list = ", ".join("'" + b.replace("'", "''").upper() + "'" for b in bu_list)
-        clause = f"UPPER(business_unit) IN ({in_list})"
-        if include_unassigned:
-            clause = f"({clause} OR business_unit IS NULL OR TRIM(business_unit)='')"
-        parts.append(clause)
+    bu_clause = _bu_clause(bu_list, include_unassigned)
+    if bu_clause:
+        parts.append(bu_clause)
 
     # Min qty (blank = ignore; 0 = include NULLs; N => >= N)
     txt = (self.qty.text() if hasattr(self, "qty") else "").strip()
@@ -2389,12 +2959,7 @@ def build_inv_filters(
     parts = q_in_ci("inventory_item_id", item_ids)
 
     if bus:
-        bu_clause = q_in_ci("business_unit", bus)
-        if include_unassigned:
-            bu_clause = (
-                f"({bu_clause} OR business_unit IS NULL OR TRIM(business_unit) = '')"
-            )
-        bits = [x for x in (parts, bu_clause) if x]
+        bits = [x for x in (parts, _bu_clause(bus, include_unassigned)) if x]
     else:
         # No BU predicate at all lets NULL/blank BUs flow through
         bits = [x for x in (parts,) if x]
@@ -2418,7 +2983,7 @@ def build_equivalent_sql(
             where.append(f"IM.ITEM_ID = '{esc(eq_items[0])}'")
         elif eq_items:
             where.append(
-                "IM.ITEM_ID IN (" + ", ".join(f"'{esc(x)}'" for x in eq_items) + ")"
+                "IM.ITEM_ID IN (" + _sql_in_list(eq_items) + ")"
             )
         if like_items:
             where.append(
@@ -2431,11 +2996,7 @@ def build_equivalent_sql(
         if len(mfg_parts) == 1:
             where.append(f"IM.manufacturer_part = '{esc(mfg_parts[0])}'")
         else:
-            where.append(
-                "IM.manufacturer_part IN ("
-                + ", ".join(f"'{esc(x)}'" for x in mfg_parts)
-                + ")"
-            )
+            where.append("IM.manufacturer_part IN (" + _sql_in_list(mfg_parts) + ")")
 
     if and_wild:
         where += [f"IM.ITEM_DESCRIPTION LIKE '%{esc(t)}%'" for t in and_wild if t]
@@ -2462,7 +3023,7 @@ def build_equivalent_sql(
 
     if bus:
         where.append(
-            "INV.BUSINESS_UNIT IN (" + ", ".join(f"'{esc(b)}'" for b in bus) + ")"
+            "INV.BUSINESS_UNIT IN (" + _sql_in_list(bus) + ")"
         )
 
     # Min qty (None => no predicate)
@@ -2471,6 +3032,8 @@ def build_equivalent_sql(
 
     where_sql = (" WHERE " + " AND ".join(where)) if where else ""
 
+    # the inventory subquery's GROUP BY already yields one row per key, so only the
+    # outer SELECT needs DISTINCT (the PI join can fan out)
     select_sql = """
     SELECT DISTINCT
       INV.business_unit     AS BU,
@@ -2495,7 +3058,7 @@ def build_equivalent_sql(
       IM.group_description  AS group_description
     FROM finance.item_master AS IM
     LEFT JOIN (
-        SELECT DISTINCT
+        SELECT
           INVENTORY_ITEM_ID,
           BUSINESS_UNIT,
           SUM(INS.onhand_quantity)
@@ -2533,51 +3096,74 @@ def _with_tip(msg: str) -> str:
 
 # ---- Reach out to Denodo ----
 _D_SESSION = None
+_D_SESSION_LOCK = threading.Lock()
 
 
 def _denodo_session():
+    """One process-wide Session so the TLS handshake (ZScaler MITM) is paid once."""
     global _D_SESSION
     if _D_SESSION is not None:
         return _D_SESSION
-    s = requests.Session()
-    retry = Retry(
-        total=5,
-        connect=5,
-        read=5,
-        backoff_factor=0.6,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=frozenset(["GET", "POST"]),
-        raise_on_status=False,
-        respect_retry_after_header=True,
-    )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-    s.mount("http://", adapter)
-    s.mount("https://", adapter)
-    s.headers.update(
-        {
-            "Accept": "application/json",
-            "Connection": "keep-alive",
-            "Accept-Encoding": "gzip, deflate",
-        }
-    )
-    _D_SESSION = s
-    return s
+    with _D_SESSION_LOCK:
+        if _D_SESSION is not None:
+            return _D_SESSION
+        s = requests.Session()
+        # the one generic retry layer: retries reuse pooled TCP+TLS connections;
+        # _send_and_normalize only adds the Denodo-specific cases on top
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=32)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        s.headers.update(
+            {
+                "Accept": "application/json",
+                "Connection": "keep-alive",
+                "Accept-Encoding": "gzip, deflate",
+            }
+        )
+        _D_SESSION = s
+        return s
+
+
+def _upper_keys(col: pd.Series) -> list:
+    """astype(str).str.strip().str.upper() in one Python pass, without the intermediate Series."""
+    return [str(x).strip().upper() for x in col.to_numpy()]
+
+
+# Columns we join on; normalize_keys strips + uppercases only these
+_JOIN_KEYS = ("item_id", "inventory_item_id", "business_unit", "manufacturer_part")
 
 
 def normalize_keys(df: pd.DataFrame) -> pd.DataFrame:
-    for c in df.columns:
-        if df[c].dtype == object:
-            # strip + uppercase keys we join on
-            if c in (
-                "item_id",
-                "inventory_item_id",
-                "business_unit",
-                "manufacturer_part",
-            ):
-                df[c] = df[c].astype(str).str.strip().str.upper()
+    # visit the few key columns directly rather than every column of wide view payloads
+    for c in _JOIN_KEYS:
+        if c in df.columns and df[c].dtype == object:
+            df[c] = _upper_keys(df[c])
     return df
 
 
+def _as_frame(df) -> pd.DataFrame:
+    """denodo_fetch_all_safe output as a DataFrame. Its keys are already normalized
+    per chunk in _normalize_denodo_payload, so callers need not re-run normalize_keys."""
+    return df if isinstance(df, pd.DataFrame) else pd.DataFrame()
+
+
+def _num_col(df: pd.DataFrame, c: str):
+    """Column c coerced to numbers with NaN -> 0, as an array; scalar 0 if absent."""
+    if c not in df.columns:
+        return 0
+    return pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy()
+
+
 def aggregate_inventory(df_inv: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate inventory per (inventory_item_id, business_unit).
@@ -2596,46 +3182,44 @@ def aggregate_inventory(df_inv: pd.DataFrame) -> pd.DataFrame:
     if df_inv is None or df_inv.empty:
         return pd.DataFrame(columns=cols_out)
 
-    df = df_inv.copy()
-
-    for c in ("inventory_item_id", "business_unit"):
-        if c in df.columns:
-            df[c] = df[c].astype(str).str.strip().str.upper()
-
-    # Numerics
-    num_cols = [
-        "onhand_quantity",
-        "open_po_qty",
-        "invenotry_demand",
-        "regional_demand",
-        "wo_demand",
-        "pid_qty",
-        "pid_demand",
-        "qty_in_transit",
-        "min_qty",
-        "unit_cost",
-    ]
-    for c in num_cols:
-        if c not in df.columns:
-            df[c] = 0
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-
-    if "currency_cd" not in df.columns:
-        df["currency_cd"] = "USD"
-    df["currency_cd"] = df["currency_cd"].astype(str).str.upper().fillna("USD")
+    # Build only the columns the rollup needs (no whole-frame copy), and fold the
+    # reserved components into one per-row column before grouping: sums are linear,
+    # so the groupby has 2 columns to sum instead of 8
+    reserved = (
+        _num_col(df_inv, "open_po_qty")
+        + _num_col(df_inv, "invenotry_demand")
+        + _num_col(df_inv, "regional_demand")
+        + _num_col(df_inv, "wo_demand")
+        + _num_col(df_inv, "pid_qty")
+        + _num_col(df_inv, "pid_demand")
+        + _num_col(df_inv, "qty_in_transit")
+    )
+    currency = (
+        df_inv["currency_cd"].astype(str).str.upper()
+        if "currency_cd" in df_inv.columns
+        else ["USD"] * len(df_inv)
+    )
+    # keys and currency as categoricals: the groupby hashes int codes and 'first'
+    # takes the codes path instead of a per-group Python call
+    df = pd.DataFrame(
+        {
+            "inventory_item_id": pd.Categorical(_upper_keys(df_inv["inventory_item_id"])),
+            "business_unit": pd.Categorical(_upper_keys(df_inv["business_unit"])),
+            "onhand_quantity": _num_col(df_inv, "onhand_quantity"),
+            "reserved_quantity": reserved,
+            "min_qty": _num_col(df_inv, "min_qty"),
+            "unit_cost": _num_col(df_inv, "unit_cost"),
+            "currency_cd": pd.Categorical(currency),
+        },
+        index=df_inv.index,
+    )
 
     g = (
-        df.groupby(["inventory_item_id", "business_unit"], dropna=False)
+        df.groupby(["inventory_item_id", "business_unit"], dropna=False, observed=True)
         .agg(
             {
                 "onhand_quantity": "sum",
-                "open_po_qty": "sum",
-                "invenotry_demand": "sum",
-                "regional_demand": "sum",
-                "wo_demand": "sum",
-                "pid_qty": "sum",
-                "pid_demand": "sum",
-                "qty_in_transit": "sum",
+                "reserved_quantity": "sum",
                 "min_qty": "max",  # typical reorder point choice
                 # simple mean (we’ll choose cheapest at view-time)
                 "unit_cost": "mean",
@@ -2645,16 +3229,10 @@ def aggregate_inventory(df_inv: pd.DataFrame) -> pd.DataFrame:
         .reset_index()
     )
 
-    demand = g[["invenotry_demand", "invenotry_demand"]].max(axis=1)
-    g["reserved_quantity"] = (
-        g["open_po_qty"]
-        + demand
-        + g["regional_demand"]
-        + g["wo_demand"]
-        + g["pid_qty"]
-        + g["pid_demand"]
-        + g["qty_in_transit"]
-    ).clip(lower=0)
+    for c in ("inventory_item_id", "business_unit", "currency_cd"):
+        g[c] = g[c].astype(object)  # callers merge/filter these as plain strings
+
+    g["reserved_quantity"] = g["reserved_quantity"].clip(lower=0)
     g["onhand_quantity"] = g["onhand_quantity"].clip(lower=0)
     g["available_quantity"] = (g["onhand_quantity"] - g["reserved_quantity"]).clip(
         lower=0
@@ -2692,13 +3270,6 @@ def aggregate_inventory_per_loc(df_inv: pd.DataFrame) -> pd.DataFrame:
     if df_inv is None or df_inv.empty or "location" not in df_inv.columns:
         return pd.DataFrame(columns=cols_out)
 
-    df = df_inv.copy()
-
-    # Normalize key fields
-    for c in ("inventory_item_id", "business_unit", "location"):
-        if c in df.columns:
-            df[c] = df[c].astype(str).str.strip().str.upper()
-
     # Numeric set (same as per-BU)
     num_cols = [
         "onhand_quantity",
@@ -2710,35 +3281,28 @@ def aggregate_inventory_per_loc(df_inv: pd.DataFrame) -> pd.DataFrame:
         "pid_demand",
         "qty_in_transit",
     ]
-    for c in num_cols:
-        if c not in df.columns:
-            df[c] = 0
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    keys = ["inventory_item_id", "business_unit", "location"]
 
-    g = (
-        df.groupby(["inventory_item_id", "business_unit", "location"], dropna=False)[
-            num_cols
-        ]
-        .sum()
-        .reset_index()
+    # Narrow frame instead of a full copy; normalized keys as categoricals so the
+    # groupby hashes int codes, and observed=True skips the unused key combinations
+    df = pd.DataFrame(
+        {c: pd.Categorical(_upper_keys(df_inv[c])) for c in keys}, index=df_inv.index
     )
+    for c in num_cols:
+        df[c] = _num_col(df_inv, c)
 
-    demand = g[["inventory_demand", "inventory_demand"]].max(axis=1)
-
-    g["reserved_quantity"] = (
-        g["open_po_qty"]
-        + demand
-        + g["regional_demand"]
-        + g["wo_demand"]
-        + g["pid_qty"]
-        + g["pid_demand"]
-        + g["qty_in_transit"]
-    ).clip(lower=0)
+    g = df.groupby(keys, dropna=False, observed=True)[num_cols].sum().reset_index()
+    for c in keys:
+        g[c] = g[c].astype(object)  # callers merge/filter these as plain strings
 
-    g["onhand_quantity"] = g["onhand_quantity"].clip(lower=0)
-    g["available_quantity"] = (g["onhand_quantity"] - g["reserved_quantity"]).clip(
-        lower=0
-    )
+    # everything but on-hand counts against availability; the view's demand column
+    # really is spelled 'invenotry_demand', as in aggregate_inventory
+    reserved_cols = [c for c in num_cols if c != "onhand_quantity"]
+    reserved = g[reserved_cols].to_numpy().sum(axis=1).clip(0, None)
+    onhand = g["onhand_quantity"].to_numpy().clip(0, None)
+    g["reserved_quantity"] = reserved
+    g["onhand_quantity"] = onhand
+    g["available_quantity"] = (onhand - reserved).clip(0, None)
 
     return g[
         [
@@ -2758,7 +3322,8 @@ def _fetch_inventory_chunked(ids_for_inv, headers, chunk_size=150):
     Fetch inventory rows for a list of item IDs.
 
     Uses denodo_fetch_all_safe auto-chunking by passing the list as a param
-    (inventory_item_id), letting it merge an IN(...) predicate into $filter.
+    (inventory_item_id), letting it merge an IN(...) predicate into $filter;
+    the chunks are sent concurrently over the shared keep-alive session.
     We deliberately omit $select to avoid 400s on unknown fields (e.g., 'location').
     """
     if not ids_for_inv:
@@ -2779,18 +3344,19 @@ def _fetch_inventory_chunked(ids_for_inv, headers, chunk_size=150):
         filter_field="inventory_item_id",
         filter_field_qualified="IM.inventory_item_id",
         chunk_size=chunk_size,
-        dedupe=True,
-        dedupe_keys=["inventory_item_id"],
+        # chunks hold disjoint IDs, and an item has one row per BU/location:
+        # deduping on the ID would keep only the first BU once the fetch fans out
+        dedupe=False,
     )
 
-    return normalize_keys(df_inv if isinstance(df_inv, pd.DataFrame) else pd.DataFrame())
+    return _as_frame(df_inv)
 
 
 def _fetch_inventory_chunked_old(ids_for_inv, headers, chunk_size=150):
     frames = []
     for i in range(0, len(ids_for_inv), chunk_size):
         batch = ids_for_inv[i : i + chunk_size]
-        ids_in = ", ".join("'" + x.replace("'", "''") + "'" for x in batch)
+        ids_in = _sql_in_list(batch)
         inv_params = {
             "$select": ",".join(
                 [
@@ -2812,7 +3378,7 @@ def _fetch_inventory_chunked_old(ids_for_inv, headers, chunk_size=150):
         }
         tmp = denodo_fetch_all_safe(f"{BASE_URL}/{INV_VIEW}", headers, inv_params)
         frames.append(
-            normalize_keys(tmp if isinstance(tmp, pd.DataFrame) else pd.DataFrame())
+            _as_frame(tmp)
         )
     return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
@@ -2873,19 +3439,26 @@ def items_lookup(
         clauses = [f"(UPPER(item_field_c30_b) LIKE '%{esc(t)}%')" for t in q_and_terms]
         qfilter = " AND ".join(clauses)
 
+        # c30_b/c10_c stay selected: step 5 reuses this frame as the controls merge
         ctrl_params = {
             "$select": "inv_item_id,item_field_c30_b,item_field_c10_c",
             "$filter": qfilter,
         }
+        if item_ids:
+            # explicit IDs: let Denodo do the intersection instead of shipping every
+            # q-code match in the catalog back for a client-side set filter
+            ctrl_params["inv_item_id"] = list(item_ids)
 
         df_ctrl_prefilter = denodo_fetch_all_safe(
-            f"{BASE_URL}/{ITEM_CONTROLS}", headers, ctrl_params
-        )
-        df_ctrl_prefilter = normalize_keys(
-            df_ctrl_prefilter
-            if isinstance(df_ctrl_prefilter, pd.DataFrame)
-            else pd.DataFrame()
+            f"{BASE_URL}/{ITEM_CONTROLS}", headers, ctrl_params,
+            list_param_key="inv_item_id",
+            filter_field="inv_item_id",
+            filter_field_qualified="IM.inv_item_id",
+            chunk_size=200,
+            dedupe=True,
+            dedupe_keys=["inv_item_id"],
         )
+        df_ctrl_prefilter = _as_frame(df_ctrl_prefilter)
 
         if df_ctrl_prefilter.empty or "inv_item_id" not in df_ctrl_prefilter.columns:
             # If Q-codes are required and none match, return empty
@@ -2908,15 +3481,15 @@ def items_lookup(
                 pd.DataFrame(),
             )
 
-        ctrl_ids = (
-            df_ctrl_prefilter["inv_item_id"]
-            .astype(str).str.strip().str.upper()
-            .dropna().unique().tolist()
-        )
+        # normalize the ids once and keep them on the frame, so the step-5 trim
+        # is a plain hashed isin; then drop blanks and dedupe keeping order
+        keys = _upper_keys(df_ctrl_prefilter["inv_item_id"])
+        df_ctrl_prefilter["inv_item_id"] = keys
+        ctrl_ids = list(dict.fromkeys(k for k in keys if k))
 
         # If caller also supplied explicit item_ids, INTERSECT with Q-code matches
         if item_ids:
-            s = set(x.strip().upper() for x in ctrl_ids)
+            s = set(ctrl_ids)  # already normalized above
             item_ids = [x for x in item_ids if x.strip().upper() in s]
 
     # ---- 3) fetch ITEM_MASTER (correct columns!) ----
@@ -2962,7 +3535,7 @@ def items_lookup(
         dedupe=True,
         dedupe_keys=["item_id"],
     )
-    df_items = normalize_keys(df_items if isinstance(df_items, pd.DataFrame) else pd.DataFrame())
+    df_items = _as_frame(df_items)
 
     if df_items.empty or "item_id" not in df_items.columns:
         empty_main = (
@@ -3009,18 +3582,20 @@ def items_lookup(
 
     # ---- 4) fetch INVENTORY (always drive off what ITEM_MASTER returned) ----
     df_inv_raw = _fetch_inventory_chunked(ids_from_items, headers, chunk_size=150)
-    df_inv_raw = normalize_keys(df_inv_raw if isinstance(df_inv_raw, pd.DataFrame) else pd.DataFrame())
+    df_inv_raw = _as_frame(df_inv_raw)
     df_inv_agg = aggregate_inventory(df_inv_raw)  # computes reserved & available
 
     # ---- 5) fetch CONTROLS for the same final IDs ----
     if q_and_terms:
-        # If we already have the prefilter, limit it to the final IDs
-        df_ctrl = df_ctrl_prefilter[df_ctrl_prefilter["inv_item_id"].astype(str).str.upper().isin(ids_from_items)].copy()
+        # If we already have the prefilter, limit it to the final IDs (no IN-list
+        # is built on this path; the rename below already returns a new frame)
+        df_ctrl = df_ctrl_prefilter[df_ctrl_prefilter["inv_item_id"].isin(set(ids_from_items))]
     else:
-        # Or fetch controls for the final IDs
+        # Or fetch controls for the final IDs; denodo_fetch_all_safe quotes each
+        # id chunk into its IN (...) only as that chunk is sent
         ctrl_params = {
             "$select": "inv_item_id,item_field_c30_b,item_field_c10_c",
-            "inv_item_id": [str(x) for x in ids_from_items],
+            "inv_item_id": ids_from_items,
         }
         df_ctrl = denodo_fetch_all_safe(
             f"{BASE_URL}/{ITEM_CONTROLS}", headers, ctrl_params,
@@ -3031,8 +3606,15 @@ def items_lookup(
             dedupe=True,
             dedupe_keys=["inv_item_id"],
         )
-        df_ctrl = normalize_keys(df_ctrl if isinstance(df_ctrl, pd.DataFrame) else pd.DataFrame())
+        df_ctrl = _as_frame(df_ctrl)
 
+    # Both joins run on one shared categorical item_id: the hash join works on the
+    # int codes, and right-side ids outside the final set (no match anyway) become NaN
+    id_dtype = pd.CategoricalDtype(ids_from_items)
+    df_items["item_id"] = df_items["item_id"].astype(id_dtype)
+
+    # q_codes / ctrl_in get their final names here, once; the output rename
+    # below only covers item and inventory columns
     if not df_ctrl.empty and "inv_item_id" in df_ctrl.columns:
         df_ctrl = df_ctrl.rename(
             columns={
@@ -3041,21 +3623,31 @@ def items_lookup(
                 "item_field_c10_c": "ctrl_in",
             }
         )
+        df_ctrl["item_id"] = _id_category(df_ctrl["item_id"], id_dtype)
         df_items = df_items.merge(df_ctrl, how="left", on="item_id")
 
+    # Push the GUI filters below the inventory join, which fans items out per BU:
+    # q-codes only need the item rows; BU / min-qty trim the inventory side when
+    # that can't change which items survive (no "unassigned" rows, qty >= 1).
+    # apply_bu_filter / apply_min_qty_filter still run after the join to drop the
+    # items left without a matching inventory row.
+    df_items = apply_qcode_filter(df_items, q_and_terms)
+    if bus and not include_unassigned:
+        df_inv_agg = df_inv_agg[df_inv_agg["business_unit"].isin(bus)]  # both upper-cased
+    if eff_min_qty is not None and eff_min_qty >= 1:
+        df_inv_agg = df_inv_agg[df_inv_agg["available_quantity"] >= int(eff_min_qty)]
+
     # ---- 6) merge + shape ----
-    df = df_items.merge(
-        df_inv_agg,
-        how="left",
-        left_on=["item_id"],
-        right_on=["inventory_item_id"],
-        suffixes=("", "_inv"),
-    )
-    if "inventory_item_id" in df.columns:
-        df = df.drop(columns=["inventory_item_id"])
+    df_inv_agg = df_inv_agg.rename(columns={"inventory_item_id": "item_id"})
+    df_inv_agg["item_id"] = _id_category(df_inv_agg["item_id"], id_dtype)
+    df = df_items.merge(df_inv_agg, how="left", on="item_id", suffixes=("", "_inv"))
+    df["item_id"] = df["item_id"].astype(object)  # downstream treats it as text
 
     if filter_positive_only and "available_quantity" in df.columns:
-        df = df[df["available_quantity"].fillna(0) >= 0]  # keep as you set (>= 0)
+        # keep as you set (>= 0); NaN counts as 0, compared straight off the array
+        # instead of through a fillna copy
+        avail = df["available_quantity"].to_numpy(dtype="float64", na_value=0.0)
+        df = df.loc[avail >= 0]
 
     out = df.rename(
         columns={
@@ -3068,9 +3660,6 @@ def items_lookup(
             "unit_cost": "perpetual_avg_cost",
             "lot_control": "lot",
             "serial_control": "serial",
-            # If normalize_keys didn't already map these:
-            "item_field_c30_b": "q_codes",
-            "item_field_c10_c": "ctrl_in",
         }
     )
 
@@ -3079,7 +3668,6 @@ def items_lookup(
     #added by ajay on 11 feb 2026
     out = normalize_all_columns(out)
     #end
-    out = apply_qcode_filter(out, q_and_terms)
     out = apply_min_qty_filter(out, eff_min_qty)
     out = apply_bu_filter(out, bus, include_unassigned=bool(include_unassigned))
 
@@ -3092,6 +3680,12 @@ def items_lookup(
 
 
 
+def _id_category(col: pd.Series, dtype: pd.CategoricalDtype) -> pd.Categorical:
+    """Upper-cased ids as a categorical of dtype; ids outside its categories become NaN."""
+    keys = pd.Series(_upper_keys(col), index=col.index)
+    return pd.Categorical(keys.where(keys.isin(dtype.categories)), dtype=dtype)
+
+
 def safe_reset_index(df: pd.DataFrame, name: str = "part_number") -> pd.DataFrame:
     """Bring the current index out as 'name' without colliding if it already exists."""
     idx_vals = df.index.to_numpy()
@@ -3104,6 +3698,24 @@ def safe_reset_index(df: pd.DataFrame, name: str = "part_number") -> pd.DataFram
 # ---- UI & Excel colors for status ----
 
 
+# One scan for pretty_sql: AND/OR between whitespace (indented on a new line),
+# clause keywords (new line), then other keywords (uppercased in place)
+_SQL_PRETTY_RE = re.compile(
+    r"\s(AND|OR)\s"
+    r"|\b(SELECT|FROM|(?:LEFT|RIGHT|INNER|FULL) JOIN|WHERE|GROUP BY|HAVING|ORDER BY)\b"
+    r"|\b(DISTINCT|ON|AND|OR|AS)\b",
+    re.IGNORECASE,
+)
+
+
+def _sql_pretty_sub(m: re.Match) -> str:
+    if m.group(1):
+        return f"\n {m.group(1).upper()} "
+    if m.group(2):
+        return "\n" + m.group(2).upper()
+    return m.group(3).upper()
+
+
 def pretty_sql(sql: str) -> str:
     """Lightweight SQL pretty-printer:
     - Newlines before major clauses
@@ -3113,53 +3725,9 @@ def pretty_sql(sql: str) -> str:
     if not s:
         return s
 
-    # collapse whitespace
+    # collapse whitespace, then break/indent/uppercase in a single pass
     s = re.sub(r"\s+", " ", s)
-
-    # break before main clauses
-    for pat in [
-        r"SELECT\b",
-        r"FROM\b",
-        r"LEFT JOIN\b",
-        r"RIGHT JOIN\b",
-        r"INNER JOIN\b",
-        r"FULL JOIN\b",
-        r"WHERE\b",
-        r"GROUP BY\b",
-        r"HAVING\b",
-        r"ORDER BY\b",
-    ]:
-        s = re.sub(pat, lambda m: "\n" + m.group(0).upper(), s, flags=re.IGNORECASE)
-
-    # indent logical operators
-    s = re.sub(r"\sAND\s", "\n AND ", s, flags=re.IGNORECASE)
-    s = re.sub(r"\sOR\s", "\n OR ", s, flags=re.IGNORECASE)
-
-    # uppercase common keywords (simple pass)
-    for kw in sorted(
-        [
-            "select",
-            "distinct",
-            "from",
-            "left join",
-            "right join",
-            "inner join",
-            "full join",
-            "on",
-            "where",
-            "group by",
-            "having",
-            "order by",
-            "and",
-            "or",
-            "as",
-        ],
-        key=len,
-        reverse=True,
-    ):
-        pattern = r"\b" + re.escape(kw) + r"\b"
-        s = re.sub(pattern, kw.upper(), s, flags=re.IGNORECASE)
-
+    s = _SQL_PRETTY_RE.sub(_sql_pretty_sub, s)
     return s.lstrip()
 
 
@@ -3176,23 +3744,37 @@ SPLIT_BG_HEX = "#e0f7fa"  # light cyan for split contributors
 STATUS_BG_BRUSH = {k: QBrush(QColor(v)) for k, v in STATUS_BG_HEX.items()}
 
 
+@functools.lru_cache(maxsize=64)
 def _hex_to_argb(hex_code: str) -> str:
     h = (hex_code or "").lstrip("#").upper()
     return ("FF" + h) if len(h) == 6 else "FFFFFFFF"
 
 
-def _merge_border(cell, *, left=None, right=None, top=None, bottom=None):
-    """Set specific border sides without wiping the others."""
-    b = cell.border
-    cell.border = Border(
-        left=left or b.left,
-        right=right or b.right,
-        top=top or b.top,
-        bottom=bottom or b.bottom,
-    )
+@functools.lru_cache(maxsize=64)
+def _solid_fill(hex_code: str):
+    """One shared solid PatternFill per colour; openpyxl style objects are immutable."""
+    from openpyxl.styles import PatternFill
+
+    argb = _hex_to_argb(hex_code)
+    return PatternFill(fill_type="solid", start_color=argb, end_color=argb)
+
+
+def _with_total_row(df: pd.DataFrame, total_currency: str = "") -> pd.DataFrame:
+    """df plus the TOTAL row write_styled_excel emits, as plain values for the unstyled fallback."""
+    cols = [str(c).strip().lower() for c in df.columns]
+    if df.empty or "est_cost" not in cols:
+        return df
+    est = cols.index("est_cost")
+    row = [None] * len(cols)
+    row[0] = "TOTAL"
+    row[est] = pd.to_numeric(df.iloc[:, est], errors="coerce").sum()
+    if total_currency and "est_currency" in cols:
+        row[cols.index("est_currency")] = total_currency
+    return pd.concat([df, pd.DataFrame([row], columns=df.columns)], ignore_index=True)
 
 
-def apply_excel_status_colors(
+def write_styled_excel(
+    df: pd.DataFrame,
     path: str,
     status_header: str = "status",
     preferred_bu: str = "",
@@ -3202,21 +3784,29 @@ def apply_excel_status_colors(
     import_fields: list[str] | None = None,
     # e.g. ['perpetual_avg_cost_used','unit_currency_used','est_cost','est_currency']
     cost_fields: list[str] | None = None,
+    # written into est_currency on the TOTAL row, e.g. 'USD'
+    total_currency: str = "",
 ) -> tuple[bool, str]:
-    try:
-        wb = load_workbook(path)
-        ws = wb.active
+    """
+    Write df to path as a styled .xlsx in a single streaming pass.
+    Fills, fonts, borders, formats and formulas are decided per row and emitted
+    with it through a write_only workbook, so no cell tree is built and nothing
+    is reloaded. On failure the plain frame is written instead.
+    """
+    # openpyxl is only needed once a sheet is exported; keep it off the startup path
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+    from openpyxl.utils import get_column_letter
 
-        # Headers
-        header_row = next(ws.iter_rows(min_row=1, max_row=1))
-        headers = [
-            str(c.value).strip() if c.value is not None else "" for c in header_row
-        ]
+    try:
+        headers = [str(c).strip() for c in df.columns]
         lower_map = {h.lower(): i + 1 for i, h in enumerate(headers) if h}
+        n = len(df)
 
         def find_col(names):
-            for n in names:
-                c = lower_map.get(n.lower())
+            for nm in names:
+                c = lower_map.get(nm.lower())
                 if c:
                     return c
             return None
@@ -3230,226 +3820,182 @@ def apply_excel_status_colors(
         bu_cols = []
         if bu_headers:
             wanted = {b.upper() for b in bu_headers}
-            for idx, h in enumerate(headers, start=1):
-                if h.upper() in wanted:
-                    bu_cols.append(idx)
-
-        # Section borders (thick right border at group ends)
-        """thin = Side(style='thin', color='FFB0B0B0')"""
-        thick = Side(style="thick", color="FF808080")
-        for c in range(1, ws.max_column + 1):
-            _merge_border(ws.cell(row=1, column=c), bottom=thick)
-        border_right_thick = Border(right=thick)
-        border_bottom_thick = Border(bottom=thick)
-        """border_right_thin = Border(right=thin)"""
-
-        # header bottom divider
-        for c in range(1, ws.max_column + 1):
-            ws.cell(row=1, column=c).border = border_bottom_thick
-
-        # Optional group borders if we can infer groups
-        def mark_group_right(edge_col):
-            if not edge_col:
-                return
-            for r in range(1, ws.max_row + 1):
-                ws.cell(row=r, column=edge_col).border = border_right_thick
-
-        # infer group edges
-        import_edge = None
-        if import_fields:
-            last = max((lower_map.get(f.lower(), 0) for f in import_fields), default=0)
-            import_edge = last if last > 0 else None
-
-        bu_edge = None
+            bu_cols = [i for i, h in enumerate(headers, start=1) if h.upper() in wanted]
+
+        # Group edges get a thick right border (import fields | BUs | cost fields)
+        edges = set()
+        for fields in (import_fields, cost_fields):
+            if fields:
+                last = max((lower_map.get(f.lower(), 0) for f in fields), default=0)
+                if last > 0:
+                    edges.add(last)
         if bu_cols:
-            bu_edge = max(bu_cols)
-
-        cost_edge = None
-        if cost_fields:
-            last = max((lower_map.get(f.lower(), 0) for f in cost_fields), default=0)
-            cost_edge = last if last > 0 else None
-
-        # apply group edges
-        mark_group_right(import_edge)
-        mark_group_right(bu_edge)
-        mark_group_right(cost_edge)
-
-        # Freeze + filter
-        ws.freeze_panes = "A2"
-        ws.auto_filter.ref = ws.dimensions
-
-        # Fills
-        pal = status_palette or STATUS_BG_HEX  # STATUS_BG_HEX you defined earlier
+            edges.add(max(bu_cols))
 
-        def fill(hexc):
-            return PatternFill(
-                fill_type="solid",
-                start_color=_hex_to_argb(hexc),
-                end_color=_hex_to_argb(hexc),
-            )
+        # Cost columns (4 dp) and the est_cost = requested_qty * unit cost formula
+        cost_like = {"perpetual_avg_cost", "perpetual_avg_cost_used", "est_cost"}
+        cost_cols = {i for i, h in enumerate(headers, start=1) if h.lower() in cost_like}
+        est_col = lower_map.get("est_cost")
+        req_col = lower_map.get("requested_qty")
+        unit_col = lower_map.get("perpetual_avg_cost_used") or lower_map.get(
+            "perpetual_avg_cost"
+        )
+        with_formula = bool(est_col and req_col and unit_col)
 
-        status_fills = {k: fill(v) for k, v in pal.items()}
-        prime_fill = fill("#e3f2fd")  # blue
-        split_fill = fill("#e0f7fa")  # cyan
+        # Styles: built once, shared by every cell that uses them
+        pal = status_palette or STATUS_BG_HEX
+        status_fills = {k: _solid_fill(v) for k, v in pal.items()}
+        prime_fill = _solid_fill(PRIME_BG_HEX)
+        split_fill = _solid_fill(SPLIT_BG_HEX)
         bold_font = Font(bold=True)
-
-        # 1) Color Status column
-        if status_col:
-            for r in range(2, ws.max_row + 1):
-                raw = ws.cell(row=r, column=status_col).value
-                key = str(raw).strip().upper() if raw is not None else ""
+        thick = Side(style="thick", color="FF808080")
+        edge_border = Border(right=thick)
+        header_border = Border(bottom=thick)
+        header_edge_border = Border(right=thick, bottom=thick)
+        total_border = Border(top=thick)
+        header_align = Alignment(horizontal="center", vertical="top")
+
+        # Fill decisions are made per row inside the streaming loop below; only the
+        # numeric BU inputs are extracted up front (column-wise coercion)
+        pref = (preferred_bu or "").upper()
+        pref_idx = headers.index(pref) + 1 if pref and pref in headers else None
+
+        shade_bus = bool(rq_col and bu_cols)
+        if shade_bus:
+
+            def ints(col):
+                s = pd.to_numeric(df.iloc[:, col - 1], errors="coerce")
+                return s.fillna(0).astype("int64").tolist()
+
+            reqs = ints(rq_col)
+            bu_vals = list(zip(*(ints(c) for c in bu_cols)))
+            pref_rel = bu_cols.index(pref_idx) if pref_idx in bu_cols else None
+
+        def row_marks(r, row):
+            """{col: (fill, bold)} for one row: status colour, then prime/split BUs."""
+            marks = {}
+            # 1) Status column
+            if status_col:
+                raw = row[status_col - 1]
+                key = "" if raw is None else str(raw).strip().upper()
                 if key.startswith("OK"):  # OK (Preferred)
                     key = "OK"
                 f = status_fills.get(key)
                 if f:
-                    ws.cell(row=r, column=status_col).fill = f
-
-        # 2) Preferred/Prime/Split (BOM pivot only)
-        pref = (preferred_bu or "").upper()
-        pref_idx = None
-        if pref and pref in headers:
-            pref_idx = headers.index(pref) + 1
-
-        if rq_col and bu_cols:
-            for r in range(2, ws.max_row + 1):
-                # requested qty
-                try:
-                    req = int(ws.cell(row=r, column=rq_col).value or 0)
-                except:
-                    req = 0
-                if req <= 0:
+                    marks[status_col] = (f, False)
+
+            # 2) Preferred/Prime/Split (BOM pivot only)
+            req = reqs[r] if shade_bus else 0
+            if req <= 0:
+                return marks
+            vals = [max(0, v) for v in bu_vals[r]]
+
+            # Preferred wins if it meets req
+            if pref_rel is not None and vals[pref_rel] >= req:
+                marks[pref_idx] = (prime_fill, True)
+                return marks
+
+            # Prime: first BU meeting req
+            prime_rel = next((i for i, v in enumerate(vals) if v >= req), None)
+            if prime_rel is not None:
+                marks[bu_cols[prime_rel]] = (prime_fill, True)
+                return marks
+
+            # Split: shade contributors until cumulative >= req
+            order = sorted(range(len(vals)), key=lambda i: vals[i], reverse=True)
+            cum = 0
+            for i in order:
+                if vals[i] <= 0:
                     continue
-
-                # BU values
-                vals = []
-                for c in bu_cols:
-                    try:
-                        v = int(ws.cell(row=r, column=c).value or 0)
-                    except:
-                        v = 0
-                    vals.append(max(0, v))
-
-                # Preferred wins if it meets req
-                if pref_idx and pref_idx in bu_cols:
-                    try:
-                        v_pref = int(ws.cell(row=r, column=pref_idx).value or 0)
-                    except:
-                        v_pref = 0
-                    if v_pref >= req:
-                        cell = ws.cell(row=r, column=pref_idx)
-                        cell.fill = prime_fill
-                        cell.font = bold_font
-                        continue
-
-                # Prime: first BU meeting req
-                prime_rel = next((i for i, v in enumerate(vals) if v >= req), None)
-                if prime_rel is not None:
-                    cell = ws.cell(row=r, column=bu_cols[prime_rel])
-                    cell.fill = prime_fill
-                    cell.font = bold_font
-                else:
-                    # Split: shade contributors until cumulative >= req
-                    order = sorted(
-                        range(len(vals)), key=lambda i: vals[i], reverse=True
-                    )
-                    cum = 0
-                    for i in order:
-                        if vals[i] <= 0:
-                            continue
-                        cell = ws.cell(row=r, column=bu_cols[i])
-                        cell.fill = split_fill
-                        cum += vals[i]
-                        if cum >= req:
-                            break
-
-        # Simple width fit
-        try:
-            for col in ws.columns:
-                width = max(
-                    (len(str(c.value)) if c.value is not None else 0) for c in col[:400]
-                )
-                ws.column_dimensions[col[0].column_letter].width = min(
-                    max(10, width + 2), 48
-                )
-        except:
-            pass
-
-        # --- Number formats for costs (4 dp) ---
-        cost_like = {"perpetual_avg_cost", "perpetual_avg_cost_used", "est_cost"}
-        for idx, h in enumerate(headers, start=1):
-            if h.strip().lower() in {n.lower() for n in cost_like}:
-                col_letter = get_column_letter(idx)
-                for r in range(2, ws.max_row + 1):
-                    ws[f"{col_letter}{r}"].number_format = "0.0000"
-
-        # --- If there is an old static TOTAL row, delete it ---
-        last = ws.max_row
-        first_col_val = str(ws.cell(row=last, column=1).value or "").strip().upper()
-        if first_col_val == "TOTAL":
-            ws.delete_rows(last, 1)
-
-        # Build an index for columns we care about
-        hdr_idx = {(h or "").strip().lower(): i for i, h in enumerate(headers, start=1)}
-
-        est_col = hdr_idx.get("est_cost")
-        req_col = hdr_idx.get("requested_qty")
-        unit_col = hdr_idx.get("perpetual_avg_cost_used") or hdr_idx.get(
-            "perpetual_avg_cost"
-        )
-
-        if est_col and req_col and unit_col:
-            est_letter = get_column_letter(est_col)
+                marks[bu_cols[i]] = (split_fill, False)
+                cum += vals[i]
+                if cum >= req:
+                    break
+            return marks
+
+        # Stream the workbook
+        values = df.astype(object).where(df.notna(), None)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+
+        # widths, panes and filter must be set before the first row is appended;
+        # widths come from one pass over the header + first 399 rows
+        widths = [len(h) for h in headers]
+        for row in values.head(399).itertuples(index=False, name=None):
+            for i, v in enumerate(row):
+                if v is not None:
+                    w = len(str(v))
+                    if w > widths[i]:
+                        widths[i] = w
+        for i, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = min(max(10, width + 2), 48)
+        ws.freeze_panes = "A2"
+        if headers:
+            ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{n + 1}"
+
+        header_row = []
+        for i, h in enumerate(headers, start=1):
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = bold_font
+            cell.alignment = header_align
+            cell.border = header_edge_border if i in edges else header_border
+            header_row.append(cell)
+        ws.append(header_row)
+
+        styled_cols = edges | cost_cols
+        if with_formula:
+            styled_cols.add(est_col)
             req_letter = get_column_letter(req_col)
             unit_letter = get_column_letter(unit_col)
-            # Write the formula row-by-row (skip header)
-            for r in range(2, ws.max_row + 1):
-                ws[f"{est_letter}{r}"].value = (
-                    f"=ROUND({req_letter}{r}*{unit_letter}{r},4)"
-                )
-                ws[f"{est_letter}{r}"].number_format = "0.0000"
+        # one pass per row: fills, borders, formats and the est_cost formula are all
+        # set as each cell is built, then the row is appended
+        for r, row in enumerate(values.itertuples(index=False, name=None)):
+            out = list(row)
+            marks = row_marks(r, row)
+            if with_formula:
+                xr = r + 2
+                out[est_col - 1] = f"=ROUND({req_letter}{xr}*{unit_letter}{xr},4)"
+            for c in styled_cols.union(marks):
+                cell = WriteOnlyCell(ws, value=out[c - 1])
+                if c in edges:
+                    cell.border = edge_border
+                if c in cost_cols:
+                    cell.number_format = "0.0000"
+                m = marks.get(c)
+                if m:
+                    cell.fill = m[0]
+                    if m[1]:
+                        cell.font = bold_font
+                out[c - 1] = cell
+            ws.append(out)
 
-        # --- TOTAL row with formula on est_cost ---
-        est_col = next(
-            (
-                i
-                for i, h in enumerate(headers, start=1)
-                if h.strip().lower() == "est_cost"
-            ),
-            None,
-        )
-        if est_col:
-            last = ws.max_row
-            total_row = last + 1
-            # label
-            ws.cell(row=total_row, column=1, value="TOTAL").font = Font(bold=True)
-            _merge_border(ws.cell(row=total_row, column=1), top=thick)
-            # formula (SUM of the est_cost column from row 2 to last)
+        # TOTAL row with a SUM formula on est_cost, in the target currency
+        if est_col and n:
             est_letter = get_column_letter(est_col)
-            ws.cell(
-                row=total_row,
-                column=est_col,
-                value=f"=SUM({est_letter}2:{est_letter}{last})",
-            ).font = Font(bold=True)
-            _merge_border(ws.cell(row=total_row, column=est_col), top=thick)
-            # draw a top divider across the whole total row for clarity
-            for c in range(1, ws.max_column + 1):
-                _merge_border(ws.cell(row=total_row, column=c), top=thick)
-
-        thick = Side(style="thick", color="FF808080")
-
-        # Re-apply bottom border under EVERY header (some earlier ops may have replaced it)
-        for c in range(1, ws.max_column + 1):
-            _merge_border(ws.cell(row=1, column=c), bottom=thick)
-
-        # Make doubly sure for these two headers (names are case-insensitive)
-        hdrs_fix = {"requested_qty", "est_currency"}
-        for idx, h in enumerate(headers, start=1):
-            if h and h.strip().lower() in hdrs_fix:
-                _merge_border(ws.cell(row=1, column=idx), bottom=thick)
+            ccy_col = find_col(["est_currency"])
+            total_row = []
+            for i in range(1, len(headers) + 1):
+                value = None
+                if i == est_col:
+                    value = f"=SUM({est_letter}2:{est_letter}{n + 1})"
+                elif i == 1:
+                    value = "TOTAL"
+                elif i == ccy_col and total_currency:
+                    value = total_currency
+                cell = WriteOnlyCell(ws, value=value)
+                cell.border = total_border
+                if i in (1, est_col):
+                    cell.font = bold_font
+                total_row.append(cell)
+            ws.append(total_row)
 
         wb.save(path)
         return True, "Excel styling applied."
     except Exception as e:
+        try:
+            _with_total_row(df, total_currency).to_excel(path, index=False)
+        except Exception:
+            pass
         return False, f"Excel styling failed: {e}"
 
 
@@ -3485,6 +4031,7 @@ class QuickIndexProvider:
     def search(self, query: str, limit: int = 5000, ordered: bool = False):
         dbp = _qi_path()
         conn = ensure_quick_index_db(dbp)
+        conn.row_factory = sqlite3.Row
         try:
             fts = _fts_build_query(query, ordered=ordered)
             rows = []
@@ -3497,23 +4044,21 @@ class QuickIndexProvider:
                 pass
 
             if have_fts and fts:
+                # ORDER BY rank + LIMIT is served inside FTS5 (top-N by bm25)
+                # instead of sorting every match on files columns
                 sql = """
                   SELECT f.path, f.name, f.size, f.is_dir
-                  FROM files f
-                  JOIN files_fts ff ON ff.rowid = f.id
-                  WHERE ff MATCH ?
-                  ORDER BY f.is_dir DESC, f.name
+                  FROM files_fts
+                  JOIN files f ON f.id = files_fts.rowid
+                  WHERE files_fts MATCH ?
+                  ORDER BY files_fts.rank
                   LIMIT ?
                 """
                 for r in conn.execute(sql, (fts, limit)):
                     rows.append((r["path"], r["name"], r["size"], r["is_dir"]))
             else:
                 # LIKE fallback (AND semantics across tokens)
-                toks = [
-                    t.strip('"')
-                    for t in re.findall(r'"[^"]+"|\\S+', str(query or ""))
-                    if t.strip()
-                ]
+                toks = _query_tokens(query)
                 if toks:
                     where = []
                     args = []
@@ -3558,9 +4103,11 @@ class WindowsSearchProvider:
         return " AND ".join(clauses)
 
     def search(self, query, limit=2000, allowed_roots=None):
-        tokens = [t for t in re.split(r"[\\s]+", str(query or "").strip()) if t]
+        tokens = _query_tokens(query)
         hits = []
         try:
+            import win32com.client as win32  # Windows-only; ImportError falls back to crawl
+
             conn = win32.Dispatch("ADODB.Connection")
             rs = win32.Dispatch("ADODB.Recordset")
             conn.Open(
@@ -3580,13 +4127,16 @@ class WindowsSearchProvider:
                 f"FROM SYSTEMINDEX WHERE {where} ORDER BY System.DateModified DESC"
             )
             rs.Open(sql, conn, 1, 1)  # adOpenKeyset, adLockReadOnly
-            while not rs.EOF:
-                name = rs.Fields.Item(0).Value
-                ftype = rs.Fields.Item(1).Value or ""
-                size = rs.Fields.Item(2).Value or 0
-                modified = rs.Fields.Item(3).Value
-                folder = rs.Fields.Item(4).Value or ""
-                path = rs.Fields.Item(5).Value or ""
+            # GetRows pulls the whole result in one COM call (column-major), instead
+            # of six Fields.Item().Value reads plus a MoveNext per row; it raises on
+            # an empty recordset, hence the EOF check
+            cols = rs.GetRows(int(limit)) if not rs.EOF else ()
+            _FileHit, _append = FileHit, hits.append
+            for name, ftype, size, modified, folder, path in zip(*cols):
+                ftype = ftype or ""
+                size = size or 0
+                folder = folder or ""
+                path = path or ""
 
                 # best-effort timestamp
                 try:
@@ -3600,8 +4150,7 @@ class WindowsSearchProvider:
                 is_dir = str(ftype).lower() in ("file folder", "folder")
                 # For folders, prefer the folder path if the item path is blank
                 p = path or folder or name
-                hits.append(FileHit(p, is_dir, size, ts, "WinIndex"))
-                rs.MoveNext()
+                _append(_FileHit(p, is_dir, size, ts, "WinIndex"))
 
             rs.Close()
             conn.Close()
@@ -3611,9 +4160,31 @@ class WindowsSearchProvider:
             return CrawlProvider(roots=allowed_roots).search(query, limit=limit)
 
 
+@functools.lru_cache(maxsize=32)
+def _crawl_name_tests(query: str) -> tuple[tuple[str, ...], tuple]:
+    """
+    Per-token tests for CrawlProvider._match, built once per query instead of per
+    file: each token matches like fnmatch(name, token + "*"), so a literal token is
+    a plain prefix check and only wildcard tokens need a compiled pattern.
+    """
+    prefixes, patterns = [], []
+    for t in _query_tokens(query):
+        t = t.lower()
+        if any(ch in t for ch in "*?["):
+            patterns.append(re.compile(fnmatch.translate(t + "*")).match)
+        else:
+            prefixes.append(t)
+    return tuple(prefixes), tuple(patterns)
+
+
 class CrawlProvider:
+    ROOT_WORKERS = 4  # roots walked at once (each keeps SCAN_WORKERS listings in flight)
+
     def __init__(self, roots=None):
         self.roots = roots or self._default_roots()
+        self._cancel = threading.Event()
+        self._found = 0
+        self._found_lock = threading.Lock()
 
     def _default_roots(self):
         roots = [os.path.expanduser("~")]
@@ -3646,67 +4217,177 @@ class CrawlProvider:
                 seen.add(r)
         return uniq
 
+    SCAN_WORKERS = 8  # concurrent directory listings per root
+
+    def _list_dir(self, dirpath, q):
+        """
+        One directory: (dirpath, hits, subdirs, files listed). Names are matched
+        first; only hits pay for entry.stat(), which Windows serves from the listing.
+        """
+        hits, subdirs, nfiles = [], [], 0
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                        if is_dir and entry.is_symlink():
+                            continue  # like os.walk: never listed or followed
+                    except OSError:
+                        continue
+                    if is_dir:
+                        subdirs.append(entry.path)
+                    else:
+                        nfiles += 1
+                    if not self._match(entry.name, q):
+                        continue
+                    # os.stat(entry.path) would follow the same link and fail the
+                    # same way, so a failed entry.stat() just drops the hit
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    hits.append(
+                        FileHit(
+                            entry.path,
+                            is_dir,
+                            0 if is_dir else st.st_size,
+                            st.st_mtime,
+                            "Local",
+                        )
+                    )
+        except OSError:
+            pass
+        return dirpath, hits, subdirs, nfiles
+
     def _walk(self, root, q, results, limit):
+        """
+        Walk root with directory listings in flight on a small pool, so the
+        getdents/stat round-trips of network mounts (SMB, OneDrive, WSL's /mnt)
+        overlap instead of running one after another.
+        """
+        dirs_scanned = files_scanned = 0
+        next_report = 0
         try:
-            dirs_scanned = files_scanned = 0
-            for dirpath, dirnames, filenames in os.walk(root):
-                # progress every ~200 items
-                if hasattr(self, "progress_cb"):
-                    if (dirs_scanned + files_scanned) % 200 == 0:
-                        self.progress_cb(dirpath, dirs_scanned, files_scanned)
-
-                # folder match
+            # folder match for the root itself
+            if self._match(os.path.basename(root), q):
                 try:
-                    st = os.stat(dirpath)
-                    if self._match(os.path.basename(dirpath), q):
-                        results.append(FileHit(dirpath, True, 0, st.st_mtime, "Local"))
-                        if len(results) >= limit:
-                            return
-                except Exception:
+                    hit = FileHit(root, True, 0, os.stat(root).st_mtime, "Local")
+                    if not self._take(limit):
+                        return
+                    results.append(hit)
+                except OSError:
                     pass
-                dirs_scanned += 1
 
-                # file matches
-                for fn in filenames:
-                    if not self._match(fn, q):
-                        continue
-                    p = os.path.join(dirpath, fn)
-                    try:
-                        st = os.stat(p)
-                        results.append(
-                            FileHit(p, False, st.st_size, st.st_mtime, "Local")
-                        )
-                        if len(results) >= limit:
-                            return
-                    except Exception:
-                        continue
-                    files_scanned += 1
+            with ThreadPoolExecutor(max_workers=self.SCAN_WORKERS) as ex:
+                inflight = {ex.submit(self._list_dir, root, q)}
+                while inflight:
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    if self._cancel.is_set():
+                        for f in inflight:
+                            f.cancel()
+                        return
+                    for fut in done:
+                        dirpath, hits, subdirs, nfiles = fut.result()
+                        dirs_scanned += 1
+                        files_scanned += nfiles
+                        # progress every ~200 items
+                        if (
+                            hasattr(self, "progress_cb")
+                            and dirs_scanned + files_scanned >= next_report
+                        ):
+                            self.progress_cb(dirpath, dirs_scanned, files_scanned)
+                            next_report = dirs_scanned + files_scanned + 200
+                        for hit in hits:
+                            if not self._take(limit):
+                                for f in inflight:
+                                    f.cancel()
+                                return
+                            results.append(hit)
+                        inflight |= {ex.submit(self._list_dir, sd, q) for sd in subdirs}
         except Exception:
             pass
 
     def _match(self, name, query):
         # any-order wildcards by default, supports quoted phrases
-        toks = [t for t in re.findall(r'"[^"]+"|\S+', query) if t.strip()]
-        if not toks:
-            return True
-        for t in toks:
-            t = t.strip('"')
-            if not fnmatch.fnmatch(name.lower(), (t + "*").lower()):
+        prefixes, patterns = _crawl_name_tests(query)
+        n = name.lower()
+        return all(n.startswith(p) for p in prefixes) and all(m(n) for m in patterns)
+
+    def _take(self, limit):
+        """Claim one result slot across all roots; once limit is reached, cancel every walk."""
+        with self._found_lock:
+            if self._found >= limit:
                 return False
-        return True
+            self._found += 1
+            if self._found >= limit:
+                self._cancel.set()
+            return True
+
+    def _walk_root(self, root, query, limit):
+        hits = []
+        self._walk(root, query, hits, limit)
+        return hits
 
     def search(self, query, limit=3000):
-        results = []
-        threads = []
-        for r in self.roots:
-            t = threading.Thread(
-                target=self._walk, args=(r, query, results, limit), daemon=True
-            )
-            t.start()
-            threads.append(t)
-        for t in threads:
-            t.join()
-        return results
+        if not self.roots:
+            return []
+        self._cancel.clear()
+        self._found = 0
+        # bounded pool instead of a thread per root; each root fills its own list
+        with ThreadPoolExecutor(max_workers=min(self.ROOT_WORKERS, len(self.roots))) as ex:
+            futs = [ex.submit(self._walk_root, r, query, limit) for r in self.roots]
+            parts = [f.result() for f in futs]
+        return [hit for part in parts for hit in part]
+
+
+# {index DB path -> its files.root key}, rebuilt only when the index folder's mtime
+# changes (a per-root folder was added or removed), so searches don't glob the tree
+_INDEX_DB_REGISTRY: dict[str, str] = {}
+_INDEX_DB_REGISTRY_MTIME = 0.0
+_INDEX_DB_REGISTRY_LOCK = threading.Lock()
+
+
+def _index_root_key(root) -> str:
+    return os.path.normcase(os.path.normpath(str(root))).rstrip("\\/")
+
+
+def _index_db_root_key(dbp: str) -> str:
+    """Root key of one index DB (sampled from a single row), or "" if it has none yet."""
+    try:
+        row = open_sqlite_ro(dbp).execute(
+            "SELECT root FROM files WHERE root IS NOT NULL LIMIT 1"
+        ).fetchone()
+    except sqlite3.Error:
+        return ""
+    return _index_root_key(row[0]) if row else ""
+
+
+def _index_db_registry(base: str) -> dict[str, str]:
+    global _INDEX_DB_REGISTRY_MTIME
+    try:
+        mtime = os.stat(base).st_mtime
+    except OSError:
+        return {}
+    with _INDEX_DB_REGISTRY_LOCK:
+        if mtime != _INDEX_DB_REGISTRY_MTIME:
+            reg = {}
+            try:
+                with os.scandir(base) as it:
+                    for entry in it:
+                        dbp = os.path.join(entry.path, "index_db.sqlite")
+                        if entry.is_dir() and os.path.exists(dbp):
+                            reg[dbp] = _INDEX_DB_REGISTRY.get(dbp) or _index_db_root_key(dbp)
+            except OSError:
+                return {}
+            _INDEX_DB_REGISTRY.clear()
+            _INDEX_DB_REGISTRY.update(reg)
+            _INDEX_DB_REGISTRY_MTIME = mtime
+        else:
+            # a DB registered before its first scan finished has no root yet
+            for dbp, rkey in _INDEX_DB_REGISTRY.items():
+                if not rkey:
+                    _INDEX_DB_REGISTRY[dbp] = _index_db_root_key(dbp)
+        return dict(_INDEX_DB_REGISTRY)
 
 
 class IndexedProvider:
@@ -3723,10 +4404,7 @@ class IndexedProvider:
         )
         if not allowed_roots:
             # all known DBs
-            for dbp in glob.glob(
-                os.path.join(base, "**", "index_db.sqlite"), recursive=True
-            ):
-                yield dbp
+            yield from _index_db_registry(base)
             return
 
         # try hashed paths first
@@ -3741,38 +4419,17 @@ class IndexedProvider:
         if not missing:
             return
 
-        # fallback: probe every DB and include those whose rows have matching files.root
-        wanted = {os.path.normcase(os.path.normpath(r)).rstrip("\\/") for r in missing}
-        for dbp in glob.glob(
-            os.path.join(base, "**", "index_db.sqlite"), recursive=True
-        ):
-            try:
-                con = open_sqlite_ro(dbp)
-                con.row_factory = sqlite3.Row
-                # sample just one row; DBs are small
-                row = con.execute(
-                    "SELECT root FROM files WHERE root IS NOT NULL LIMIT 1"
-                ).fetchone()
-                con.close()
-                if row:
-                    rkey = os.path.normcase(os.path.normpath(str(row["root"]))).rstrip(
-                        "\\/"
-                    )
-                    if rkey in wanted:
-                        yield dbp
-            except Exception:
-                try:
-                    con.close()
-                except:
-                    pass
-                continue
+        # fallback: DBs whose rows have a matching files.root
+        wanted = {_index_root_key(r) for r in missing}
+        for dbp, rkey in _index_db_registry(base).items():
+            if rkey in wanted:
+                yield dbp
 
     def search(self, query: str, limit=5000, allowed_roots=None):
-        tokens = [
-            t.strip('"')
-            for t in re.findall(r'"[^"]+"|\S+', str(query or ""))
-            if t.strip()
-        ]
+        tokens = _query_tokens(query)
+        # trigram MATCH keeps LIKE's substring semantics; short pieces (or a
+        # unicode61 build) come back "" and take the LIKE path
+        fts = _fts_build_query(query) if _FTS_TOKENIZE == "trigram" else ""
         results = []
         for dbp in self._iter_db_paths(allowed_roots):
             if not os.path.exists(dbp):
@@ -3780,7 +4437,17 @@ class IndexedProvider:
             conn = open_sqlite_ro(dbp)
             conn.row_factory = sqlite3.Row
             try:
-                if tokens:
+                if fts and _fts_in_sync(conn):
+                    sql = """
+                        SELECT f.path, f.name, f.is_dir, f.size, f.mtime
+                        FROM files_fts
+                        JOIN files f ON f.id = files_fts.rowid
+                        WHERE files_fts MATCH ?
+                        ORDER BY f.mtime DESC
+                        LIMIT ?
+                    """
+                    args = [fts, max(0, int(limit) - len(results))]
+                elif tokens:
                     where = []
                     args = []
                     for t in tokens:
@@ -3814,7 +4481,7 @@ class IndexedProvider:
                     if len(results) >= limit:
                         break
             finally:
-                conn.close()
+                conn.row_factory = None  # pooled; stays open for the next query
             if len(results) >= limit:
                 break
         return results
@@ -3835,19 +4502,14 @@ class EnoviaProvider:
             v = con.execute(
                 "SELECT val FROM meta WHERE key='last_full_scan'"
             ).fetchone()
-            con.close()
-            return v[0] if v else "—"
+            return _stamp_text(v[0]) if v else "—"
         except Exception:
             return "—"
 
     def search(self, query: str, limit=2000):
         if not self.available():
             return []
-        toks = [
-            t.strip('"').lower()
-            for t in re.findall(r'"[^"]+"|\S+', str(query or ""))
-            if t.strip()
-        ]
+        toks = [t.lower() for t in _query_tokens(query)]
         where = " AND ".join(["LOWER(name) LIKE ?"] * len(toks)) if toks else "1=1"
         args = ["%" + t.replace("*", "%") + "%" for t in toks]
         con = open_sqlite_ro(self.dbp)
@@ -3858,7 +4520,6 @@ class EnoviaProvider:
             + " ORDER BY last_seen DESC LIMIT ?"
         )
         rows = con.execute(sql, args + [int(limit)]).fetchall()
-        con.close()
         hits = []
         for r in rows:
             name = r["name"] or "(unnamed)"
@@ -3867,6 +4528,112 @@ class EnoviaProvider:
         return hits
 
 
+# FindFirstFileExW(FindExInfoBasic, FIND_FIRST_EX_LARGE_FETCH): no 8.3 names and a
+# bigger per-call buffer, so SMB/OneDrive listings take far fewer round trips than os.scandir
+_FIND_EX_INFO_BASIC = 1
+_FIND_EX_SEARCH_NAME_MATCH = 0
+_FIND_FIRST_EX_LARGE_FETCH = 2
+_FILE_ATTRIBUTE_DIRECTORY = 0x10
+_FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+_IO_REPARSE_TAG_SYMLINK = 0xA000000C
+_FILETIME_EPOCH_DELTA = 11644473600  # seconds between 1601-01-01 and 1970-01-01
+
+
+@functools.lru_cache(maxsize=1)
+def _win_find_api():
+    from ctypes import wintypes
+
+    class WIN32_FIND_DATAW(ctypes.Structure):
+        _fields_ = [
+            ("dwFileAttributes", wintypes.DWORD),
+            ("ftCreationTime", wintypes.FILETIME),
+            ("ftLastAccessTime", wintypes.FILETIME),
+            ("ftLastWriteTime", wintypes.FILETIME),
+            ("nFileSizeHigh", wintypes.DWORD),
+            ("nFileSizeLow", wintypes.DWORD),
+            ("dwReserved0", wintypes.DWORD),
+            ("dwReserved1", wintypes.DWORD),
+            ("cFileName", wintypes.WCHAR * 260),
+            ("cAlternateFileName", wintypes.WCHAR * 14),
+        ]
+
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    find_first = k32.FindFirstFileExW
+    find_first.argtypes = [
+        wintypes.LPCWSTR, ctypes.c_int, ctypes.c_void_p,
+        ctypes.c_int, ctypes.c_void_p, wintypes.DWORD,
+    ]
+    find_first.restype = wintypes.HANDLE
+    find_next = k32.FindNextFileW
+    find_next.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+    find_next.restype = wintypes.BOOL
+    find_close = k32.FindClose
+    find_close.argtypes = [wintypes.HANDLE]
+    find_close.restype = wintypes.BOOL
+    return WIN32_FIND_DATAW, find_first, find_next, find_close
+
+
+def _filetime_to_epoch(ft):
+    return ((ft.dwHighDateTime << 32) | ft.dwLowDateTime) / 1e7 - _FILETIME_EPOCH_DELTA
+
+
+def _win_scandir(path: str):
+    """Yield (name, is_dir, size, mtime, ctime) for path's entries via FindFirstFileExW."""
+    data_t, find_first, find_next, find_close = _win_find_api()
+    data = data_t()
+    h = find_first(
+        os.path.join(path, "*"),
+        _FIND_EX_INFO_BASIC,
+        ctypes.byref(data),
+        _FIND_EX_SEARCH_NAME_MATCH,
+        None,
+        _FIND_FIRST_EX_LARGE_FETCH,
+    )
+    if h is None or h == ctypes.c_void_p(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        while True:
+            name = data.cFileName
+            if name not in (".", ".."):
+                attrs = data.dwFileAttributes
+                # match DirEntry.is_dir(follow_symlinks=False): junctions count, symlinks don't
+                is_dir = bool(attrs & _FILE_ATTRIBUTE_DIRECTORY) and not (
+                    attrs & _FILE_ATTRIBUTE_REPARSE_POINT
+                    and data.dwReserved0 == _IO_REPARSE_TAG_SYMLINK
+                )
+                size = None if is_dir else (data.nFileSizeHigh << 32) | data.nFileSizeLow
+                yield (
+                    name,
+                    is_dir,
+                    size,
+                    _filetime_to_epoch(data.ftLastWriteTime),
+                    _filetime_to_epoch(data.ftCreationTime),
+                )
+            if not find_next(h, ctypes.byref(data)):
+                break
+    finally:
+        find_close(h)
+
+
+def _py_scandir(path: str):
+    """Portable counterpart of _win_scandir built on os.scandir."""
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except Exception:
+                is_dir = False
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except Exception:
+                yield entry.name, is_dir, None, None, None
+                continue
+            yield entry.name, is_dir, (None if is_dir else st.st_size), st.st_mtime, st.st_ctime
+
+
+_scandir_basic = _win_scandir if sys.platform.startswith("win") else _py_scandir
+
+
 class IndexWorker(QThread):
     # root, scanned, updated, seconds
     progress_root = pyqtSignal(str, int, int, float)
@@ -3899,8 +4666,14 @@ class IndexWorker(QThread):
             ".git",
             ".svn",
         }
-        BATCH = 800
+        BATCH = 500  # rows per executemany
+        COMMIT_ROWS = 20000  # rows per write transaction (one WAL sync each)
+        # subtrees are listed on a pool of this size; this thread stays the only writer
+        SCAN_WORKERS = index_scan_workers()
         PROG_INTERVAL = 1.0
+        # open_sqlite already runs WAL + synchronous=NORMAL with a big cache/mmap;
+        # a lost index is rebuilt by the next pass, so policy may drop the syncs too
+        sync_off = index_sync_off_enabled()
 
         try:
             for root in self.roots or []:
@@ -3924,7 +4697,18 @@ class IndexWorker(QThread):
                         )
                 except Exception:
                     pass
+                if sync_off:
+                    db.execute("PRAGMA synchronous = OFF")
                 cur = db.cursor()
+                # first fill of an empty table: skip per-row FTS triggers, rebuild once.
+                # A re-scan keeps them (files_au only fires on a real rename), so its
+                # FTS work scales with what changed instead of re-tokenizing every row
+                bulk = (
+                    not self.incremental
+                    and db.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+                )
+                if bulk:
+                    begin_bulk_index(db)
 
                 scanned_count = 0
                 updated_count = 0
@@ -3932,23 +4716,62 @@ class IndexWorker(QThread):
                 last_prog = started
                 current_pass = int(started)
 
+                pending = []
+                touched = []  # (pass_id, root, path) of rows that didn't change
+                uncommitted = 0
+
+                # incremental: what the last pass stored, so unchanged entries only
+                # bump pass_id (keeps them out of the stale purge) instead of a full upsert
+                known = {}
+                if self.incremental:
+                    known = {
+                        p: (m, sz, d)
+                        for p, m, sz, d in db.execute(
+                            "SELECT path, mtime, size, is_dir FROM files WHERE root = ?", (root,)
+                        )
+                    }
+
+                def _flush(commit=False):
+                    # one prepared statement per batch; the transaction spans
+                    # COMMIT_ROWS so a pass pays one sync per checkpoint, not per batch
+                    nonlocal updated_count, uncommitted
+                    if pending or touched:
+                        if not db.in_transaction:
+                            db.execute("BEGIN IMMEDIATE")
+                    if pending:
+                        cur.executemany(
+                            """
+                            INSERT INTO files(root, path, name, ext, size, mtime, ctime, is_dir, parent, pass_id)
+                            VALUES(?,?,?,?,?,?,?,?,?,?)
+                            ON CONFLICT(root, path) DO UPDATE SET
+                                name=excluded.name,
+                                ext=excluded.ext,
+                                size=excluded.size,
+                                mtime=excluded.mtime,
+                                ctime=excluded.ctime,
+                                is_dir=excluded.is_dir,
+                                parent=excluded.parent,
+                                pass_id=excluded.pass_id
+                        """,
+                            pending,
+                        )
+                        # one per upserted row; total_changes would also count the
+                        # files_ai/files_au trigger writes into the FTS shadow tables
+                        updated_count += len(pending)
+                        uncommitted += len(pending)
+                        pending.clear()
+                    if touched:
+                        cur.executemany(
+                            "UPDATE files SET pass_id = ? WHERE root = ? AND path = ?", touched
+                        )
+                        uncommitted += len(touched)
+                        touched.clear()
+                    if uncommitted and (commit or uncommitted >= COMMIT_ROWS):
+                        db.commit()
+                        uncommitted = 0
+
                 def _upsert(path, is_dir, name, ext, size, mtime, ctime, parent):
-                    nonlocal updated_count
-                    before = db.total_changes
-                    cur.execute(
-                        """
-                        INSERT INTO files(root, path, name, ext, size, mtime, ctime, is_dir, parent, pass_id)
-                        VALUES(?,?,?,?,?,?,?,?,?,?)
-                        ON CONFLICT(root, path) DO UPDATE SET
-                            name=excluded.name,
-                            ext=excluded.ext,
-                            size=excluded.size,
-                            mtime=excluded.mtime,
-                            ctime=excluded.ctime,
-                            is_dir=excluded.is_dir,
-                            parent=excluded.parent,
-                            pass_id=excluded.pass_id
-                    """,
+                    pending.append(
                         (
                             root,
                             path,
@@ -3960,10 +4783,10 @@ class IndexWorker(QThread):
                             1 if is_dir else 0,
                             parent,
                             current_pass,
-                        ),
+                        )
                     )
-                    if db.total_changes > before:
-                        updated_count += 1
+                    if len(pending) >= BATCH:
+                        _flush()
 
                 def _emit_progress(current_dir):
                     nonlocal last_prog
@@ -3984,68 +4807,60 @@ class IndexWorker(QThread):
                         except Exception:
                             pass
 
-                def _scan_dir(d):
-                    nonlocal scanned_count
+                def _list_dir(d):
+                    """Pool worker: one scandir pass -> (d, upsert rows, subdirs). Never touches the DB."""
+                    rows, subdirs = [], []
+                    join, splitext = os.path.join, os.path.splitext
+                    parent = None  # dirname of every entry in d; computed once
                     try:
-                        with os.scandir(d) as it:
-                            for entry in it:
-                                if getattr(self, "_stop", False):
-                                    return
-                                name = entry.name
-                                if name in SKIP_NAMES:
-                                    continue
-                                try:
-                                    is_dir = entry.is_dir(follow_symlinks=False)
-                                except Exception:
-                                    is_dir = False
-
-                                path = entry.path
+                        for name, is_dir, size, mtime, ctime in _scandir_basic(d):
+                            if self._stop:
+                                break
+                            if name in SKIP_NAMES:
+                                continue
+                            path = join(d, name)
+                            if parent is None:
                                 parent = os.path.dirname(path)
-                                if is_dir:
-                                    try:
-                                        st = entry.stat(follow_symlinks=False)
-                                        size = None
-                                        mtime = st.st_mtime
-                                        ctime = st.st_ctime
-                                    except Exception:
-                                        size = None
-                                        mtime = None
-                                        ctime = None
-                                    _upsert(
-                                        path, True, name, "", size, mtime, ctime, parent
-                                    )
-                                    scanned_count += 1
-                                    if scanned_count % BATCH == 0:
-                                        db.commit()
-                                        _emit_progress(path)
-                                    _scan_dir(path)
-                                else:
-                                    try:
-                                        st = entry.stat(follow_symlinks=False)
-                                        size = st.st_size
-                                        mtime = st.st_mtime
-                                        ctime = st.st_ctime
-                                    except Exception:
-                                        size = None
-                                        mtime = None
-                                        ctime = None
-                                    ext = os.path.splitext(name)[1][1:].lower()
-                                    _upsert(
-                                        path,
-                                        False,
-                                        name,
-                                        ext,
-                                        size,
-                                        mtime,
-                                        ctime,
-                                        parent,
-                                    )
-                                    scanned_count += 1
-                                    if scanned_count % BATCH == 0:
-                                        db.commit()
-                                        _emit_progress(parent or d)
+                            if is_dir:
+                                subdirs.append(path)
+                                ext = ""
+                            else:
+                                ext = splitext(name)[1][1:].lower()
+                            # already in the files upsert's column order
+                            rows.append(
+                                (root, path, name, ext, size, mtime, ctime,
+                                 1 if is_dir else 0, parent, current_pass)
+                            )
                     except (PermissionError, FileNotFoundError, OSError):
-                        return
+                        pass
+                    return d, rows, subdirs
+
+                def _scan_tree(top):
+                    # scandir/stat are I/O-bound and release the GIL, so directories are
+                    # listed on a pool while this thread stays the only SQLite writer
+                    nonlocal scanned_count
+                    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+                        inflight = {ex.submit(_list_dir, top)}
+                        while inflight:
+                            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                            for fut in done:
+                                d, rows, subdirs = fut.result()
+                                if known:
+                                    for row in rows:
+                                        # (mtime, size, is_dir) as the last pass stored them
+                                        if known.pop(row[1], None) == (row[5], row[4], row[7]):
+                                            touched.append((current_pass, root, row[1]))
+                                        else:
+                                            pending.append(row)
+                                else:
+                                    # whole directories go straight onto the batch
+                                    pending.extend(rows)
+                                scanned_count += len(rows)
+                                if len(pending) + len(touched) >= BATCH:
+                                    _flush()
+                                _emit_progress(d)  # throttled to PROG_INTERVAL
+                                if not self._stop:
+                                    inflight |= {ex.submit(_list_dir, sd) for sd in subdirs}
 
                 # ensure we index the root row itself
                 try:
@@ -4070,7 +4885,8 @@ class IndexWorker(QThread):
                 _emit_progress(root)
 
                 # walk
-                _scan_dir(root)
+                _scan_tree(root)
+                _flush(commit=True)
 
                 # finalize this root
                 completed = not bool(getattr(self, "_stop", False))
@@ -4082,23 +4898,32 @@ class IndexWorker(QThread):
                         )
                         db.commit()  # commit before FTS maintenance
 
-                        # try to keep FTS fresh, best-effort
-                        try:
-                            cur.execute(
-                                "INSERT INTO files_fts(files_fts) VALUES('rebuild')"
-                            )
-                        except Exception:
-                            pass
-                        db.commit()
+                        if not bulk:
+                            # triggers already kept FTS in step; just fold the segments
+                            # written this pass (cheap 'merge', not 'optimize'/'rebuild')
+                            try:
+                                cur.execute(
+                                    "INSERT INTO files_fts(files_fts, rank) VALUES('merge', -500)"
+                                )
+                            except Exception:
+                                pass
+                            db.commit()
 
                         # stamp last scan using the canonical helper
                         try:
-                            set_last_indexed_now_for_root(root)
+                            set_last_indexed_now_for_root(db_path, root)
                         except Exception:
                             pass
                 finally:
+                    if bulk:
+                        # also on stop/error: never leave the DB without its triggers
+                        try:
+                            db.commit()
+                            end_bulk_index(db)
+                        except Exception:
+                            pass
                     try:
-                        db.close()
+                        db.close()  # drops the pooled handle, and any synchronous=OFF with it
                     except Exception:
                         pass
 
@@ -4392,9 +5217,33 @@ class SerialScanListener(QThread):
 
 
 class PandasModel(QAbstractTableModel):
+    """
+    Read-only view over a DataFrame. Columns are held as plain NumPy arrays
+    (one per column) so data() is two list/array lookups instead of a
+    DataFrame.iloc call per painted cell.
+    """
+
+    _STATUS_FG = QBrush(QColor("#111111"))
+
     def __init__(self, dataframe: pd.DataFrame):
         super().__init__()
+        self._bind(dataframe)
+
+    def _bind(self, dataframe: pd.DataFrame):
         self._dataframe = dataframe
+        self._columns = [dataframe.iloc[:, i].to_numpy() for i in range(dataframe.shape[1])]
+        # status colouring is per row; resolve the keys once, positionally
+        if "status" in dataframe.columns:
+            self._status_keys = [
+                normalize_status_key(v) for v in dataframe["status"].tolist()
+            ]
+        else:
+            self._status_keys = None
+
+    def update_dataframe(self, dataframe: pd.DataFrame):
+        self.beginResetModel()
+        self._bind(dataframe)
+        self.endResetModel()
 
     def rowCount(self, parent=None):
         return self._dataframe.shape[0]
@@ -4407,25 +5256,14 @@ class PandasModel(QAbstractTableModel):
             return None
 
         if role == Qt.DisplayRole:
-            value = self._dataframe.iloc[index.row(), index.column()]
-            return str(value)
+            return str(self._columns[index.column()][index.row()])
 
-        if role == Qt.BackgroundRole and "status" in self._dataframe.columns:
-            try:
-                key = normalize_status_key(self._dataframe.at[index.row(), "status"])
-                brush = STATUS_BG_BRUSH.get(key)
-                if brush:
-                    return brush
-            except Exception:
-                pass
+        if role == Qt.BackgroundRole and self._status_keys is not None:
+            return STATUS_BG_BRUSH.get(self._status_keys[index.row()])
 
-        if role == Qt.ForegroundRole and "status" in self._dataframe.columns:
-            try:
-                key = normalize_status_key(self._dataframe.at[index.row(), "status"])
-                if key in STATUS_BG_BRUSH:
-                    return QBrush(QColor("#111111"))
-            except Exception:
-                pass
+        if role == Qt.ForegroundRole and self._status_keys is not None:
+            if self._status_keys[index.row()] in STATUS_BG_BRUSH:
+                return self._STATUS_FG
 
         return None
 
@@ -4442,6 +5280,80 @@ class PandasModel(QAbstractTableModel):
         return Qt.ItemIsSelectable | Qt.ItemIsEnabled
 
 
+class ResultsFilterProxy(QSortFilterProxyModel):
+    """
+    Case-insensitive quick filter over every column of a PandasModel.
+    Typed text is a literal substring (never a regex), and each source row is
+    flattened to one lower-cased string once per model, so a keystroke costs a
+    single `in` test per row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._haystack = None
+
+    def setSourceModel(self, model):
+        self._haystack = None
+        super().setSourceModel(model)
+        if model is not None:
+            model.modelReset.connect(self._drop_haystack)
+
+    def _drop_haystack(self):
+        self._haystack = None
+
+    def setFilterPattern(self, text: str):
+        needle = (text or "").strip().casefold()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self.invalidateFilter()
+
+    def _rows(self) -> list:
+        if self._haystack is None:
+            df = getattr(self.sourceModel(), "_dataframe", None)
+            if isinstance(df, pd.DataFrame) and not df.empty:
+                # \x1f keeps a match from spanning two cells
+                self._haystack = (
+                    df.astype(str).agg("\x1f".join, axis=1).str.casefold().tolist()
+                )
+            else:
+                self._haystack = []
+        return self._haystack
+
+    def filterAcceptsRow(self, src_row, src_parent):
+        if not self._needle:
+            return True
+        rows = self._rows()
+        if src_row >= len(rows):
+            return True
+        return self._needle in rows[src_row]
+
+    def visible_source_rows(self):
+        """Source rows that pass the filter, in source order; None when no filter is set."""
+        if not self._needle:
+            return None
+        return sorted(self.mapToSource(self.index(r, 0)).row() for r in range(self.rowCount()))
+
+
+def _build_bu_choice_model(bus, parent=None) -> QStandardItemModel:
+    """'(None)' + BU codes, with the BU description as each item's tooltip."""
+    m = QStandardItemModel(parent)
+    items = [QStandardItem("(None)")]
+    for bu in bus:
+        it = QStandardItem(bu)
+        it.setToolTip(POSSIBLE_BUS.get(bu, ""))
+        items.append(it)
+    m.invisibleRootItem().appendRows(items)
+    return m
+
+
+@functools.lru_cache(maxsize=1)
+def _bu_choice_model() -> QStandardItemModel:
+    # full list never changes: build once, share across panes (unparented, never freed)
+    return _build_bu_choice_model(_BU_KEYS_SORTED)
+
+
 class DenodoQuery(QWidget):
     def __init__(self):
         super().__init__()
@@ -4817,9 +5729,9 @@ class DenodoQuery(QWidget):
 
         vb_tools.addWidget(QLabel("Preferred BU:", w))
         self.preferred_bu_combo = QComboBox(w)
-        self.preferred_bu_combo.addItem("(None)")
-        for bu in sorted(POSSIBLE_BUS.keys()):
-            self.preferred_bu_combo.addItem(bu)
+        self.preferred_bu_combo.setInsertPolicy(QComboBox.NoInsert)
+        self.preferred_bu_combo.view().setUniformItemSizes(True)
+        self.preferred_bu_combo.setModel(_bu_choice_model())
         self.preferred_bu_combo.currentTextChanged.connect(
             lambda s: setattr(
                 self, "preferred_bu", "" if s == "(None)" else s.strip().upper()
@@ -5197,10 +6109,10 @@ class DenodoQuery(QWidget):
         checked = [b.text().strip().upper() for b in self.BUs if b.isChecked()]
         cur = self.preferred_bu_combo.currentText().strip().upper()
         self.preferred_bu_combo.blockSignals(True)
-        self.preferred_bu_combo.clear()
-        self.preferred_bu_combo.addItem("(None)")
-        for bu in checked:
-            self.preferred_bu_combo.addItem(bu)
+        # swap in a combo-owned subset model; clear() would empty the shared one
+        self.preferred_bu_combo.setModel(
+            _build_bu_choice_model(checked, self.preferred_bu_combo)
+        )
         # keep current if still valid
         if cur and cur in checked:
             idx = self.preferred_bu_combo.findText(cur)
@@ -5621,22 +6533,25 @@ class DenodoQuery(QWidget):
         """
         exts = {e.lower() for e in exts}
         for root in roots:
-            root = os.path.abspath(root)
-            for dirpath, dirnames, filenames in os.walk(root):
-                # Depth limit
-                depth_parts = pathlib.Path(dirpath).relative_to(root).parts
-                if len(depth_parts) > max_depth:
-                    # Don't descend further
-                    dirnames[:] = []
+            # scandir reuses the directory listing's type info, so no per-entry stat;
+            # depth rides along on the stack instead of re-deriving it from the path
+            stack = [(os.path.abspath(root), 0)]
+            while stack:
+                d, depth = stack.pop()
+                try:
+                    with os.scandir(d) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if depth < max_depth:
+                                        stack.append((entry.path, depth + 1))
+                                elif os.path.splitext(entry.name)[1].lower() in exts:
+                                    yield entry.path
+                            except OSError:
+                                # Ignore odd filenames
+                                continue
+                except OSError:
                     continue
-                for fn in filenames:
-                    p = os.path.join(dirpath, fn)
-                    try:
-                        if os.path.splitext(fn)[1].lower() in exts:
-                            yield p
-                    except Exception:
-                        # Ignore odd filenames
-                        continue
 
 
     def _match_files_for_pn(files: Iterable[str], pn: str) -> List[str]:
@@ -5647,21 +6562,12 @@ class DenodoQuery(QWidget):
         - simple wildcard fnmatch '*PN*'
         """
         pn_upper = pn.upper()
-        results = []
-        for f in files:
-            name = os.path.basename(f)
-            stem = os.path.splitext(name)[0]
-            if stem.upper() == pn_upper:
-                results.append(f)
-                continue
-            # token boundary match
-            if re.search(rf"(?:^|[_\-\. ]){re.escape(pn_upper)}(?:$|[_\-\. ])", name.upper()):
-                results.append(f)
-                continue
-            # fallback wildcard
-            if fnmatch.fnmatch(name.upper(), f"*{pn_upper}*"):
-                results.append(f)
-        return results
+        # the exact-stem and token-boundary cases are both contained in '*PN*', so one
+        # test per file is enough; compile only when the PN itself carries glob chars
+        if any(ch in pn_upper for ch in "*?["):
+            glob_hit = re.compile(fnmatch.translate(f"*{pn_upper}*")).match
+            return [f for f in files if glob_hit(os.path.basename(f).upper())]
+        return [f for f in files if pn_upper in os.path.basename(f).upper()]
 
 
     def _resolve_item_ids_from_local_sources(self, bom_on: bool) -> List[str]:
@@ -6133,12 +7039,7 @@ class DenodoQuery(QWidget):
         desc_col = next((c for c, n in candidates.items() if n in desc_wants), None)
 
         # --- normalize parts (strip SolidWorks extensions, uppercase) ---
-        def _normalize_part(p: str) -> str:
-            s = str(p).strip()
-            s = re.sub(r"\.(sldprt|sldasm|slddrw)$", "", s, flags=re.IGNORECASE)
-            return s.upper()
-
-        parts_series = df[pn_col].astype(str).map(_normalize_part)
+        parts_series = normalize_part_series(df[pn_col])
         parts_series = parts_series.replace("", pd.NA).dropna()
         parts = parts_series.tolist()
 
@@ -6163,7 +7064,7 @@ class DenodoQuery(QWidget):
         bom_map = {}
         if qty_col:
             tmp = df[[pn_col, qty_col]].copy()
-            tmp[pn_col] = tmp[pn_col].astype(str).map(_normalize_part)
+            tmp[pn_col] = normalize_part_series(tmp[pn_col])
             tmp[qty_col] = pd.to_numeric(tmp[qty_col], errors="coerce")
             tmp = tmp.dropna(subset=[pn_col])
             grouped = tmp.groupby(pn_col)[qty_col].sum(min_count=1)
@@ -6174,7 +7075,7 @@ class DenodoQuery(QWidget):
         csv_desc_map = {}
         if desc_col:
             dtmp = df[[pn_col, desc_col]].copy()
-            dtmp[pn_col] = dtmp[pn_col].astype(str).map(_normalize_part)
+            dtmp[pn_col] = normalize_part_series(dtmp[pn_col])
             dtmp[desc_col] = dtmp[desc_col].astype(str).str.strip()
             csv_desc_map = {pn: d for pn, d in zip(dtmp[pn_col], dtmp[desc_col]) if pn}
 
@@ -6287,33 +7188,25 @@ class IndexBuilderPane(QWidget):
 
     def _load_index_roots(self):
         try:
-            with open(self._index_roots_path(), "r", encoding="utf-8") as f:
-                obj = json.load(f)
-                # expected shape: {"roots":[{"path": "...", "last_full_scan": "...", "files_count": 0}]}
-                if isinstance(obj, dict) and isinstance(obj.get("roots"), list):
-                    return obj["roots"]
+            obj = _read_json_cached(self._index_roots_path())
+            # expected shape: {"roots":[{"path": "...", "last_full_scan": "...", "files_count": 0}]}
+            if isinstance(obj, dict) and isinstance(obj.get("roots"), list):
+                return obj["roots"]
         except Exception:
             pass
         return []  # empty list means no roots yet
 
     def _save_index_roots(self, roots):
-        path = self._index_roots_path()
-        tmp = path + ".tmp"
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump({"roots": roots}, f, indent=2)
-        os.replace(tmp, path)
+        _atomic_write_json(self._index_roots_path(), {"roots": roots})
 
     def _locations_path(self):
         return str(app_paths()["locations"])
 
     def _save_locations_checked(self, checked_paths: list[str]):
         # Persist "which locations should File Search use" as a simple list
-        path = self._locations_path()
-        tmp = path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump({"checked_roots": list(checked_paths or [])}, f, indent=2)
-        os.replace(tmp, path)
+        _atomic_write_json(
+            self._locations_path(), {"checked_roots": list(checked_paths or [])}
+        )
 
     def _refresh_totals(self):
         files = 0
@@ -6349,8 +7242,7 @@ class IndexBuilderPane(QWidget):
             return []
 
         try:
-            with open(p, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _read_json_cached(p)
         except Exception:
             return []
 
@@ -6432,10 +7324,7 @@ class IndexBuilderPane(QWidget):
         p = self._index_roots_path()
         data = {"roots": self._collect_table_roots()}
         try:
-            tmp = p + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            os.replace(tmp, p)
+            _atomic_write_json(p, data)
         except Exception as e:
             # Non-fatal: we don't block UI; print to console for debugging
             print("index_roots write error:", e)
@@ -6497,6 +7386,7 @@ class IndexBuilderPane(QWidget):
         # 3) Reset table & add rows
         self.table.setSortingEnabled(False)
         self.table.setRowCount(0)
+        self._path_rows = None
 
         for rec in cleaned:
             # Paint the row with whatever was saved
@@ -6567,6 +7457,9 @@ class IndexBuilderPane(QWidget):
         self.table.setItem(r, self.COL_CHECK, chk)
 
         self.table.setItem(r, self.COL_PATH, QTableWidgetItem(path))
+        rows = getattr(self, "_path_rows", None)
+        if rows is not None:
+            rows.setdefault(path.strip().lower(), r)
         self.table.setItem(r, self.COL_FILES, QTableWidgetItem(f"{files:,}"))
         self.table.setItem(r, self.COL_UPDATED, QTableWidgetItem(f"{updated:,}"))
         self.table.setItem(r, self.COL_LAST, QTableWidgetItem(last))
@@ -6820,6 +7713,7 @@ class IndexBuilderPane(QWidget):
         rows = sorted({ix.row() for ix in self.table.selectedIndexes()}, reverse=True)
         for r in rows:
             self.table.removeRow(r)
+        self._path_rows = None
         self._save_index_roots(self._gather_roots_from_table())
         self._save_locations_checked(self._selected_paths_to_index())
 
@@ -6890,19 +7784,25 @@ class IndexBuilderPane(QWidget):
 
     # ---------- signal handlers from worker ----------
     def _row_of_path(self, path: str) -> int:
-        p = (path or "").strip().lower()
-        for r in range(self.table.rowCount()):
-            if self.table.item(r, self.COL_PATH).text().strip().lower() == p:
-                return r
-        return -1
+        r = self._row_for_path(path)
+        return -1 if r is None else r
 
     def _row_for_path(self, path: str):
+        # {normalized path: row}, rebuilt lazily; a stale hit (user sort, edit) forces one rebuild
         want = (path or "").strip().lower()
+        rows = getattr(self, "_path_rows", None)
+        if rows is not None:
+            r = rows.get(want)
+            if r is not None:
+                it = self.table.item(r, self.COL_PATH)
+                if it and (it.text() or "").strip().lower() == want:
+                    return r
+        rows = self._path_rows = {}
         for r in range(self.table.rowCount()):
             it = self.table.item(r, self.COL_PATH)
-            if it and (it.text() or "").strip().lower() == want:
-                return r
-        return None
+            if it:
+                rows.setdefault((it.text() or "").strip().lower(), r)
+        return rows.get(want)
 
     def _set_num(self, row: int, col: int, val: int):
         it = self.table.item(row, col)
@@ -7628,6 +8528,8 @@ class AuthWindow(QWidget):
         if not user or not pwd:
             QMessageBox.warning(self, "Missing", "Username and password are required.")
             return
+        import keyring
+
         keyring.set_password("Denodo", user, pwd)
         QMessageBox.information(self, "Saved", f"Credentials stored for user {user}.")
         self.close()
@@ -7770,9 +8672,19 @@ class DataWindow(QWidget):
             "• Ctrl/Cmd+C to copy."
         )
 
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText("Filter rows…")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setMaximumWidth(260)
+        self.filter_edit.setToolTip(
+            "Show only rows containing this text in any column; Export and Copy use the filtered rows."
+        )
+
         ribbon.addWidget(back)
         ribbon.addSpacing(8)
         ribbon.addWidget(open_files)
+        ribbon.addSpacing(8)
+        ribbon.addWidget(self.filter_edit)
         ribbon.addStretch(1)
         ribbon.addWidget(btn_export)
         ribbon.addWidget(btn_copy)
@@ -7925,6 +8837,20 @@ class DataWindow(QWidget):
             cost_base["BU"] = cost_base["BU"].astype(str).str.upper()
             cost_base["part_number"] = cost_base["part_number"].astype(str)
 
+            # conversion is linear, so one factor per source currency covers every row;
+            # computed once here instead of a row-wise apply for each requested PN
+            fx_factors = {}
+
+            def _fx_factor(ccy):
+                f = fx_factors.get(ccy)
+                if f is None:
+                    f = fx_factors[ccy] = _fx_convert_local(1.0, ccy, tgt, rates)
+                return f
+
+            cost_base["unit_cost_tgt"] = cost_base["perpetual_avg_cost"] * cost_base[
+                "currency_cd"
+            ].map(_fx_factor)
+
             def allocate_cost_for_row(pn: str, req: int) -> tuple[float, float, str]:
                 """Preferred BU first, then cheapest of the rest (in target currency)."""
                 if req <= 0:
@@ -7932,12 +8858,6 @@ class DataWindow(QWidget):
                 rows = cost_base[cost_base["part_number"] == pn].copy()
                 if rows.empty:
                     return 0.0, 0.0, tgt
-                rows["unit_cost_tgt"] = rows.apply(
-                    lambda r: _fx_convert_local(
-                        r["perpetual_avg_cost"], r.get("currency_cd", tgt), tgt, rates
-                    ),
-                    axis=1,
-                )
                 rows["available_quantity"] = (
                     rows["available_quantity"].clip(lower=0).astype(int)
                 )
@@ -8131,6 +9051,8 @@ class DataWindow(QWidget):
         self.table_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table_view.setSortingEnabled(True)
+        # fixed row heights: the view never measures rows while scrolling
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
         self.model = PandasModel(
             self.current_view_df
@@ -8147,10 +9069,11 @@ class DataWindow(QWidget):
             except Exception:
                 pass
 
-        self.proxy = QSortFilterProxyModel(self)
+        self.proxy = ResultsFilterProxy(self)
         self.proxy.setSourceModel(self.model)
         self.proxy.setDynamicSortFilter(True)
         self.table_view.setModel(self.proxy)
+        self.filter_edit.textChanged.connect(self.proxy.setFilterPattern)
         self.table_view.sortByColumn(0, Qt.AscendingOrder)
 
         # --- header: restore widths if we have them; else auto-size once, then Interactive ---
@@ -8313,21 +9236,13 @@ class DataWindow(QWidget):
             if isinstance(self.current_view_df, pd.DataFrame)
             else self.df.copy()
         )
-        if "est_cost" in df_out.columns and not df_out.empty:
-            total = pd.DataFrame(
-                [
-                    {
-                        df_out.columns[0]: "TOTAL",
-                        "est_cost": df_out["est_cost"].sum(),
-                        "est_currency": self.target_currency,
-                    }
-                ]
-            )
-            df_out = pd.concat([df_out, total], ignore_index=True)
-
-        df_out.to_excel(path, index=False)
-
-        ok, msg = apply_excel_status_colors(
+        # export what the table shows: rows hidden by the quick filter stay out
+        visible = self._visible_source_rows()
+        if visible is not None:
+            df_out = df_out.iloc[[r for r in visible if r < len(df_out)]]
+        # the styled writer adds the TOTAL row (as a SUM formula) itself
+        ok, msg = write_styled_excel(
+            df_out,
             path,
             status_header="status",
             preferred_bu=getattr(self, "preferred_bu", ""),
@@ -8340,14 +9255,27 @@ class DataWindow(QWidget):
                 "est_cost",
                 "est_currency",
             ],
+            total_currency=(getattr(self, "target_currency", "USD") or "USD").upper(),
         )
         QMessageBox.information(self, "Export", msg if ok else f"Export note: {msg}")
 
+    def _visible_source_rows(self):
+        """Source rows left by the quick filter (source order), or None when nothing is filtered."""
+        proxy = getattr(self, "proxy", None)
+        if isinstance(proxy, ResultsFilterProxy):
+            return proxy.visible_source_rows()
+        return None
+
     def copy_selection(self):
         sel_model = self.table_view.selectionModel()
         if sel_model is None:
             return
         idxs = sel_model.selectedIndexes()
+        visible = self._visible_source_rows()
+        if visible is not None:
+            # selections made before the filter changed may still name hidden rows
+            visible = set(visible)
+            idxs = [ix for ix in idxs if self.proxy.mapToSource(ix).row() in visible]
 
         def to_src(ix):
             m = self.table_view.model()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# headless Qt; the app module lives at the repo root
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([""])
+    yield app
@@ -0,0 +1,19 @@
+import That_Search_Tool as tst
+
+
+def test_bu_clause_is_case_insensitive_in_list():
+    assert tst._bu_clause(["aaa01", " ", "BBB02"], False) == (
+        "upper(business_unit) in ('AAA01', 'BBB02')"
+    )
+
+
+def test_bu_clause_include_unassigned_widens_selected_bus():
+    clause = tst._bu_clause(["AAA01"], True)
+    assert clause.startswith("(upper(business_unit) in ('AAA01')")
+    assert clause.endswith("OR TRIM(business_unit)='')")
+
+
+def test_bu_clause_without_bus_is_empty():
+    # no BU selected means no predicate at all, unassigned or not
+    assert tst._bu_clause([], True) == ""
+    assert tst._bu_clause(None, False) == ""
@@ -0,0 +1,16 @@
+import pytest
+
+import That_Search_Tool as tst
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["OneDrive", "OneDrive - Contoso", "onedrive - contoso", "ONEDRIVE", "Contoso SharePoint", "sharepoint libs"],
+)
+def test_sync_folder_names_match_case_insensitively(name):
+    assert tst._is_sync_folder_name(name)
+
+
+@pytest.mark.parametrize("name", ["Documents", "My OneDrive", "Share Point", ""])
+def test_other_profile_folders_are_not_sync_folders(name):
+    assert not tst._is_sync_folder_name(name)
@@ -0,0 +1,32 @@
+import re
+import sqlite3
+
+import That_Search_Tool as tst
+
+STAMP_RE = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"
+
+
+def test_stamp_text_formats_epoch_digits():
+    assert re.fullmatch(STAMP_RE, tst._stamp_text("1792133631"))
+    assert re.fullmatch(STAMP_RE, tst._stamp_text(1792133631))
+    assert tst._stamp_text("2026-01-01 10:00") == "2026-01-01 10:00"
+    assert tst._stamp_text(None) == ""
+
+
+def test_enovia_last_indexed_round_trips_through_meta_schema(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    csv_path = tmp_path / "ENOVIA_Export.csv"
+    csv_path.write_text("ID,Name\n1,BRACKET\n", encoding="utf-8")
+
+    tst.enovia_ingest_csv(str(csv_path))
+
+    con = sqlite3.connect(tst.enovia_db_path())
+    try:
+        val, kind = con.execute(
+            "SELECT val, typeof(val) FROM meta WHERE key='last_full_scan'"
+        ).fetchone()
+    finally:
+        con.close()
+    assert kind == "text"  # TEXT affinity: the int is stored as digits
+    assert val.isdigit()
+    assert re.fullmatch(STAMP_RE, tst.EnoviaProvider().last_indexed())
@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+import That_Search_Tool as tst
+
+
+@pytest.fixture
+def trigram(monkeypatch):
+    monkeypatch.setattr(tst, "_FTS_TOKENIZE", "trigram")
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [
+        ("abc*", '"abc"'),
+        ("*Coating* removal", '"coating" AND "removal"'),
+        ('"abc def"', '"abc def"'),
+        ("abc*def", ""),  # inner wildcard: LIKE keeps the ordering
+        ("ab?d", ""),
+        ("ab", ""),  # under a trigram
+        ("   ", ""),
+    ],
+)
+def test_fts_build_query_trigram(trigram, q, expected):
+    assert tst._fts_build_query(q) == expected
+
+
+def test_fts_build_query_trigram_ordered(trigram):
+    assert tst._fts_build_query("abc* def", ordered=True) == '"abc def"'
+
+
+def test_fts_in_sync_needs_table_and_triggers():
+    con = sqlite3.connect(":memory:")
+    assert not tst._fts_in_sync(con)
+    con.execute("CREATE TABLE files_fts(name)")
+    assert not tst._fts_in_sync(con)  # triggers dropped mid first pass
+    con.execute("CREATE TABLE files(name)")
+    con.execute(
+        "CREATE TRIGGER files_ai AFTER INSERT ON files BEGIN SELECT 1; END"
+    )
+    assert tst._fts_in_sync(con)
+
+
+@pytest.fixture
+def index(qapp, tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    root.mkdir()
+    for name in ("abc_1_def.sldprt", "def_2_abc.sldprt", "xyz.sldprt"):
+        (root / name).write_text("x")
+    db = tmp_path / "idx" / "index_db.sqlite"
+    monkeypatch.setattr(tst, "index_db_path", lambda r: str(db))
+    tst.IndexWorker([str(root)]).run()
+    return root
+
+
+def names(hits):
+    return sorted(h.path.replace("\\", "/").rsplit("/", 1)[-1] for h in hits)
+
+
+def test_indexed_search_inner_wildcard_keeps_order(index):
+    hits = tst.IndexedProvider().search("abc*def", allowed_roots=[str(index)])
+    assert names(hits) == ["abc_1_def.sldprt"]
+
+
+def test_indexed_search_trigram_match(index):
+    hits = tst.IndexedProvider().search("ABC sldprt", allowed_roots=[str(index)])
+    assert names(hits) == ["abc_1_def.sldprt", "def_2_abc.sldprt"]
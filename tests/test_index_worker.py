@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+import That_Search_Tool as tst
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    for d in ("a", "a/b", "c"):
+        (root / d).mkdir(parents=True)
+    for i, d in enumerate(("a", "a/b", "c", "c")):
+        (root / d / f"part{i}.sldprt").write_text("x" * (i + 1))
+    db = tmp_path / "idx" / "index_db.sqlite"
+    monkeypatch.setattr(tst, "index_db_path", lambda r: str(db))
+    return root
+
+
+def run_pass(root, incremental=False):
+    """Run one IndexWorker pass in this thread; returns (scanned, updated)."""
+    done = []
+    worker = tst.IndexWorker([str(root)], incremental=incremental)
+    worker.root_done.connect(lambda r, scanned, updated, secs: done.append((scanned, updated)))
+    worker.run()
+    assert len(done) == 1
+    return done[0]
+
+
+def test_updated_count_is_one_per_row(qapp, tree):
+    # first fill (bulk, triggers dropped): root + 3 dirs + 4 files
+    assert run_pass(tree) == (8, 8)
+
+
+def test_updated_count_ignores_fts_trigger_writes(qapp, tree):
+    run_pass(tree)
+    for i in range(20):
+        (tree / "c" / f"new{i}.sldprt").write_text("y")
+    # re-scan keeps files_ai/files_au live; their FTS writes must not be counted
+    assert run_pass(tree) == (28, 28)
+
+
+def file_count(root):
+    con = sqlite3.connect(tst.index_db_path(str(root)))
+    try:
+        return con.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_incremental_pass_skips_unchanged_rows(qapp, tree):
+    run_pass(tree)
+    time.sleep(1.1)  # pass_id is whole seconds; the purge must see a new pass
+    # only the root row is always upserted
+    assert run_pass(tree, incremental=True) == (8, 1)
+    assert file_count(tree) == 8  # touched rows survived the stale purge
+
+
+def test_incremental_pass_upserts_changed_and_purges_removed(qapp, tree):
+    run_pass(tree)
+    time.sleep(1.1)
+    (tree / "c" / "part2.sldprt").write_text("changed size")
+    (tree / "c" / "part3.sldprt").unlink()
+    # root, part2, and c itself (its mtime moved with the unlink)
+    assert run_pass(tree, incremental=True) == (7, 3)
+    assert file_count(tree) == 7
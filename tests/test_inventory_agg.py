@@ -0,0 +1,46 @@
+import pandas as pd
+
+import That_Search_Tool as tst
+
+
+def test_per_location_rollup_reads_the_views_demand_column():
+    inv = pd.DataFrame(
+        {
+            "inventory_item_id": ["10001", " 10001", "10002"],
+            "business_unit": ["aaa01", "AAA01", "AAA01"],
+            "location": ["BIN1", "bin1", "BIN2"],
+            "onhand_quantity": ["5", 3, 2],
+            "invenotry_demand": [1, 2, 4],
+            "open_po_qty": [1, None, 0],
+        }
+    )
+
+    out = tst.aggregate_inventory_per_loc(inv).set_index("location")
+
+    assert list(out.columns) == [
+        "inventory_item_id", "business_unit", "available_quantity",
+        "onhand_quantity", "reserved_quantity",
+    ]
+    assert out.loc["BIN1", "onhand_quantity"] == 8
+    assert out.loc["BIN1", "reserved_quantity"] == 4
+    assert out.loc["BIN1", "available_quantity"] == 4
+    # demand above on-hand clips availability at zero
+    assert out.loc["BIN2", "available_quantity"] == 0
+
+
+def test_per_location_rollup_without_location_is_empty():
+    inv = pd.DataFrame(
+        {"inventory_item_id": ["10001"], "business_unit": ["AAA01"], "onhand_quantity": [1]}
+    )
+    out = tst.aggregate_inventory_per_loc(inv)
+    assert out.empty
+    assert "available_quantity" in out.columns
+
+
+def test_id_category_upper_cases_and_drops_unknown_ids():
+    dtype = pd.CategoricalDtype(["A1", "B2"])
+    col = pd.Series([" a1", "B2", "c3", None], index=[10, 11, 12, 13])
+    cat = tst._id_category(col, dtype)
+    assert cat.dtype == dtype
+    assert list(cat[:2]) == ["A1", "B2"]
+    assert pd.isna(cat[2]) and pd.isna(cat[3])
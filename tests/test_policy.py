@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+import That_Search_Tool as tst
+
+
+@pytest.fixture
+def policy(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROGRAMDATA", str(tmp_path))
+    path = tmp_path / "PartSearch" / "policy.json"
+    path.parent.mkdir()
+
+    def write(text):
+        path.write_text(text, encoding="utf-8")
+
+    return write
+
+
+def test_policy_defaults_without_a_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROGRAMDATA", str(tmp_path))
+    assert tst._read_policy() == {}
+    assert tst.index_scan_workers() == 8
+    assert tst.file_search_enabled()
+    assert not tst.index_sync_off_enabled()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(4, 4), ("2", 2), (0, 1), (-3, 1), (100, 32), ("lots", 8), (None, 8)],
+)
+def test_index_scan_workers_is_clamped(policy, value, expected):
+    policy(json.dumps({"index_scan_workers": value}))
+    assert tst.index_scan_workers() == expected
+
+
+@pytest.mark.parametrize("text", ["{not json", "[1, 2]"])
+def test_unreadable_policy_is_empty(policy, text):
+    policy(text)
+    assert tst._read_policy() == {}
+    assert tst.index_scan_workers() == 8
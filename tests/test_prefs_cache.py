@@ -0,0 +1,31 @@
+import os
+
+import That_Search_Tool as tst
+
+
+def test_prefs_read_after_write_in_same_mtime_tick(tmp_path, monkeypatch):
+    user = tmp_path / "user_prefs.json"
+    monkeypatch.setattr(
+        tst, "_prefs_paths", lambda: (str(tmp_path / "machine.json"), str(user))
+    )
+
+    assert tst._prefs_write({"default_bus": ["AAA01"]})
+    assert tst._prefs_read()["default_bus"] == ["AAA01"]
+    st = os.stat(user)
+
+    # same size, and pinned to the same mtime: the stat signature can't tell them apart
+    assert tst._prefs_write({"default_bus": ["BBB02"]})
+    os.utime(user, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.path.getsize(user) == st.st_size
+
+    assert tst._prefs_read()["default_bus"] == ["BBB02"]
+
+
+def test_prefs_read_returns_a_copy(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        tst, "_prefs_paths",
+        lambda: (str(tmp_path / "machine.json"), str(tmp_path / "user.json")),
+    )
+    first = tst._prefs_read()
+    first["default_bus"].append("ZZZ")
+    assert "ZZZ" not in tst._prefs_read()["default_bus"]
@@ -0,0 +1,27 @@
+import pandas as pd
+
+import That_Search_Tool as tst
+
+
+def frame():
+    return pd.DataFrame(
+        {"item_id": ["1", "2", "3", "4"], "q_codes": ["Q1, Q12", "q12", "Q1|Q7", None]}
+    )
+
+
+def test_qcode_filter_matches_whole_tokens_only():
+    out = tst.apply_qcode_filter(frame(), [" q1 "])
+    assert list(out["item_id"]) == ["1", "3"]
+
+
+def test_qcode_filter_requires_every_code():
+    out = tst.apply_qcode_filter(frame(), ["Q1", "q12"])
+    assert list(out["item_id"]) == ["1"]
+    assert tst.apply_qcode_filter(frame(), ["Q1", "Q99"]).empty
+
+
+def test_qcode_filter_without_codes_or_column():
+    df = frame()
+    assert tst.apply_qcode_filter(df, None) is df
+    assert tst.apply_qcode_filter(df, ["  "]).equals(df)
+    assert tst.apply_qcode_filter(df.drop(columns="q_codes"), ["Q1"]).empty
@@ -0,0 +1,44 @@
+import fnmatch
+
+import pytest
+
+import That_Search_Tool as tst
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ('abc "part 7" *def', ["abc", "part 7", "*def"]),
+        ("  abc\tdef  ", ["abc", "def"]),
+        ('"" " " x', ["x"]),
+        (None, []),
+    ],
+)
+def test_query_tokens(query, expected):
+    assert tst._query_tokens(query) == expected
+
+
+def test_crawl_name_tests_split_literal_and_wildcard_tokens():
+    prefixes, patterns = tst._crawl_name_tests('BRK "Part 7" *101?')
+    assert prefixes == ("brk", "part 7")
+    assert len(patterns) == 1
+    # cached per query: the walk asks once per file name
+    assert tst._crawl_name_tests("brk") is tst._crawl_name_tests("brk")
+
+
+@pytest.mark.parametrize(
+    "name, query",
+    [
+        ("BRK-1013.sldprt", "brk"),
+        ("BRK-1013.sldprt", "*101?"),
+        ("BRK-1013.sldprt", "brk *1013*"),
+        ("bracket.sldprt", "brk"),
+        ("BRK-1013.sldprt", "[ab]rk"),
+    ],
+)
+def test_crawl_match_agrees_with_fnmatch(name, query):
+    provider = tst.CrawlProvider(roots=[])
+    expected = all(
+        fnmatch.fnmatch(name.lower(), t.lower() + "*") for t in tst._query_tokens(query)
+    )
+    assert provider._match(name, query) is expected
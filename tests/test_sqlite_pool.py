@@ -0,0 +1,43 @@
+import sqlite3
+import threading
+
+import pytest
+
+import That_Search_Tool as tst
+
+
+def test_checkout_replaces_a_connection_closed_by_its_caller(tmp_path):
+    db = str(tmp_path / "a.sqlite")
+    con = tst.open_sqlite(db)
+    assert tst.open_sqlite(db) is con
+    con.close()
+    fresh = tst.open_sqlite(db)
+    assert fresh is not con
+    assert fresh.execute("SELECT 1").fetchone() == (1,)
+
+
+def test_exit_close_reaches_other_threads_pools(tmp_path):
+    db = str(tmp_path / "b.sqlite")
+    errors = []
+    ready, closed = threading.Event(), threading.Event()
+
+    def worker():
+        con = tst.open_sqlite(db)
+        ready.set()
+        closed.wait(10)  # keep the thread (and its thread-local pool) alive
+        try:
+            con.execute("SELECT 1")
+        except sqlite3.ProgrammingError as e:
+            errors.append(str(e))
+
+    t = threading.Thread(target=worker)
+    t.start()
+    assert ready.wait(10)
+    mine = tst.open_sqlite_ro(db)
+    tst._close_sqlite_pool()
+    closed.set()
+    t.join()
+
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        mine.execute("SELECT 1")
+    assert len(errors) == 1 and "closed" in errors[0]
@@ -0,0 +1,44 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+import That_Search_Tool as tst
+
+
+def bom():
+    return pd.DataFrame(
+        {
+            "part_number": ["P1", "P2"],
+            "requested_qty": [2, 3],
+            "perpetual_avg_cost_used": [1.5, 2.0],
+            "est_cost": [3.0, 6.0],
+            "est_currency": ["USD", "USD"],
+        }
+    )
+
+
+def last_row(path):
+    ws = load_workbook(path).active
+    return [c.value for c in list(ws.iter_rows())[-1]]
+
+
+def test_styled_excel_total_row_carries_target_currency(tmp_path):
+    path = str(tmp_path / "bom.xlsx")
+    ok, _ = tst.write_styled_excel(bom(), path, total_currency="EUR")
+    assert ok
+    assert last_row(path) == ["TOTAL", None, None, "=SUM(D2:D3)", "EUR"]
+
+
+def test_styled_excel_fallback_keeps_total_row(tmp_path, monkeypatch):
+    def broken(hex_code):
+        raise ValueError("bad colour")
+
+    monkeypatch.setattr(tst, "_solid_fill", broken)
+    path = str(tmp_path / "bom.xlsx")
+    ok, msg = tst.write_styled_excel(bom(), path, total_currency="EUR")
+    assert not ok and "bad colour" in msg
+    assert last_row(path) == ["TOTAL", None, None, 9, "EUR"]
+
+
+def test_total_row_needs_an_est_cost_column():
+    df = bom().drop(columns="est_cost")
+    assert tst._with_total_row(df, "EUR") is df